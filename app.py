@@ -1,11 +1,14 @@
-import pandas as pd
 import streamlit as st
-import requests
-import time
 
-from service.player_data import PlayerData
-from service.cleaner import DataCleaner
-from utils.helpers import get_patches_data
+from service.player_data import fetch_player_data
+from service.comparison import compare_to_lobby
+from service.cube import AggregateCube
+from service.dashboard import curve_figure, timeseries_figure, winrate_figure
+from service.match_index import MatchIndex
+from service.query import CLEANING_STEPS, run_steps
+from service.rolling import RollingForm
+from utils.profiling import make_profiler
+from utils.startup import warm_up
 
 st.title("That's gonna be dota analysis app")
 
@@ -15,60 +18,93 @@ player_name = st.sidebar.text_input(
     "Enter player's name (case_insensitive, like 'mind_control')")
 min_patch = st.sidebar.text_input(
     "Enter minimal patch here, like 7.27 (App requests data up to last match played, starting from that patch)")  # make slider (min-max)
-patch_data = get_patches_data()
+compare = st.sidebar.checkbox("Compare with other players in the same games")
 run = st.sidebar.button('Run')
 
 
-# get data of a player
-@st.cache
-def get_data(player_name, min_patch) -> None:
-    """Super-function to acquire data from OpenDota."""
-    player = PlayerData(player=player_name, min_patch=min_patch)
+# warm phase runs once per constants_ttl, reruns only read its results
+def get_constants() -> dict:
+    """Constants, lookup tables and client pool shared between reruns."""
+    return warm_up()
 
-    player.get_player_id(
-    ).get_match_ids(
-    ).get_matches_data(
-    ).get_player_stats(
-    ).merge_player_data_with_match()
 
-    return player.player_data
+@st.cache(allow_output_mutation=True)
+def get_indices() -> dict:
+    """Match indices of already fetched players shared between reruns and
+    sessions, each index swaps its state under its own lock.
+    """
+    return {}
+
+
+def get_matches(player_name, min_patch, patch_data, keep_lobby=False) -> MatchIndex:
+    """Returns index of player's matches, fetching data only when the
+    requested patch range isn't held yet.
+    """
+    indices = get_indices()
+    key = (player_name.lower(), keep_lobby)
+    index = indices.get(key)
+    if index is None or not index.covers(min_patch):
+        player = fetch_player_data(player_name, min_patch, keep_lobby)
+        index = indices.setdefault(key, MatchIndex(patch_data)).add(player)
+    return index
+
+
+@st.cache(allow_output_mutation=True)
+def get_forms() -> dict:
+    """Recent form of already seen players, updated with new games only."""
+    return {}
+
+
+@st.cache(allow_output_mutation=True)
+def get_cubes() -> dict:
+    """Aggregate cubes of already seen players, updated with new games only."""
+    return {}
 
 
 def clean_data(data, patch_data):
-    cleaner = DataCleaner()
-    clean_data = (
-        data
-        .pipe(cleaner.clean_patch, patch_data)
-        .pipe(cleaner.clean_team)
-        .pipe(cleaner.clean_league)
-        .pipe(cleaner.clean_hero)
-        .pipe(cleaner.clean_win)
-        .pipe(cleaner.clean_start_time)
-        .pipe(cleaner.clean_duration)
-        .pipe(cleaner.clean_kda)
-        .pipe(cleaner.clean_roaming)
-        .pipe(cleaner.clean_player_slot)
-        .pipe(cleaner.clean_dn_t)
-        .pipe(cleaner.clean_lh_t)
-        .pipe(cleaner.clean_gold_t)
-        .pipe(cleaner.clean_xp_t)
-        .pipe(cleaner.clean_lane)
-        .pipe(cleaner.clean_lane_neutral_kills)
-        .pipe(cleaner.convert_to_int)
-        .pipe(cleaner.get_highest_streak)
-        .pipe(cleaner.clean_xp_adv)
-        .pipe(cleaner.clean_gold_adv)
-    )
-
-    return clean_data
+    # profiler of DOTA_PROFILE is shared with fetches, so stages are numbered
+    # in one sequence over all runs of the process
+    return run_steps(data, CLEANING_STEPS, patch_data, make_profiler())
 
 
 if run:
     if player_name and min_patch:
-        player_data = get_data(player_name, min_patch)
+        patch_data = get_constants()["patches_data"]
+        names = [patch["name"] for patch in patch_data]
+        if min_patch not in names:
+            st.sidebar.warning(f"Unknown patch {min_patch}, try one of {', '.join(names[-5:])}")
+            st.stop()
+        index = get_matches(player_name, min_patch, patch_data, compare)
+        player_data = index.between_patches(min_patch)
         cleaned_data = clean_data(player_data.copy(), patch_data)
 
+        cube = get_cubes().setdefault(player_name.lower(), AggregateCube())
+        cube.update(cleaned_data)
+        # cube holds every game seen so far, summaries only show chosen patches
+        patches = names[names.index(min_patch):]
+
         st.write("Data sample after cleaning")
         st.write(cleaned_data.sample())
+
+        st.write("Recent form")
+        form = get_forms().setdefault(player_name.lower(), RollingForm())
+        st.write(form.update(cleaned_data).current())
+
+        st.write("Winrate by hero")
+        st.plotly_chart(winrate_figure(cube, by="hero", patch=patches))
+        st.write("Gold advantage by side")
+        st.plotly_chart(curve_figure(
+            player_data.assign(side=cleaned_data["side"]), "radiant_gold_adv", by=["side"]
+        ))
+        st.write("Gold per minute over time")
+        st.plotly_chart(timeseries_figure(cleaned_data, "gold_per_min", by="win"))
+        st.write("Winrate by patch and side")
+        st.write(cube.winrate(by=["patch", "side"], patch=patches))
+        st.write("Average last hits at 10 minutes by lane")
+        st.write(cube.query("lh_10", by=["lane"], patch=patches))
+
+        if compare:
+            st.write("Percentile ranks against the lobby, lane and same hero")
+            st.write(compare_to_lobby(index.lobby_for(player_data), index.player_id))
     else:
         st.sidebar.warning('Input necessary data, please')
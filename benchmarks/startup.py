@@ -0,0 +1,165 @@
+"""Startup benchmark of the app: cold import time of every module app.py
+imports (streamlit included), time to first paint of a fresh app.py run and
+time of a rerun with warm caches, which must not touch network.
+
+python -m benchmarks.startup --player mind_control --patch 7.27
+"""
+import argparse
+import ast
+from pathlib import Path
+import runpy
+import subprocess
+import sys
+import time
+import types
+from unittest import mock
+
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def app_imports(path: Path = APP) -> list:
+    """Top-level modules imported by app.py."""
+    modules = []
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def time_cold_import(runs: int = 5) -> float:
+    """Best time of importing app's modules in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {', '.join(app_imports())}; print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=APP.parent,
+        )
+        timings.append(float(result.stdout))
+    return min(timings)
+
+
+class StopRun(Exception):
+    pass
+
+
+def streamlit_stub(inputs: dict, cache: dict) -> types.ModuleType:
+    """Stand-in for streamlit which answers widgets whose label mentions a
+    key of inputs, memoizes st.cache functions in cache and records time of
+    every element drawn.
+    """
+    st = types.ModuleType("streamlit")
+    st.painted = []
+
+    def paint(*args, **kwargs):
+        st.painted.append(time.perf_counter())
+
+    def widget(label, *args, **kwargs):
+        paint()
+        return next((value for key, value in inputs.items() if key in label.lower()), None)
+
+    def cached(func=None, **options):
+        def decorator(func):
+            def wrapper(*args):
+                key = (func.__qualname__, repr(args))
+                if key not in cache:
+                    cache[key] = func(*args)
+                return cache[key]
+            return wrapper
+        return decorator(func) if func else decorator
+
+    def stop():
+        raise StopRun
+
+    st.sidebar = types.SimpleNamespace(
+        text_input=widget, checkbox=widget, button=widget, warning=paint
+    )
+    st.title = st.write = st.plotly_chart = st.warning = paint
+    st.cache = cached
+    st.stop = stop
+    return st
+
+
+def run_app(inputs: dict, cache: dict, start: float = None) -> tuple:
+    """Executes app.py once. Returns seconds from start (now by default) to
+    the first paint and to the end of the script.
+    """
+    st = streamlit_stub(inputs, cache)
+    start = time.perf_counter() if start is None else start
+    # only streamlit is swapped, modules imported by the run stay loaded
+    # (with their caches) for the following reruns
+    real_streamlit = sys.modules.get("streamlit")
+    sys.modules["streamlit"] = st
+    try:
+        runpy.run_path(str(APP), run_name="__main__")
+    except StopRun:
+        pass
+    finally:
+        if real_streamlit is None:
+            del sys.modules["streamlit"]
+        else:
+            sys.modules["streamlit"] = real_streamlit
+    return st.painted[0] - start, time.perf_counter() - start
+
+
+def first_paint(start: float) -> None:
+    """Prints time to first paint of the landing page since start."""
+    try:
+        import streamlit  # noqa: F401, the real import is a part of startup
+    except ImportError:
+        pass
+    print(run_app({}, {}, start)[0])
+
+
+def time_first_paint(runs: int = 5) -> float:
+    """Best time to first paint of app.py in a fresh interpreter, including
+    imports of streamlit and app's modules.
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        "from benchmarks.startup import first_paint; first_paint(start)"
+    )
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=APP.parent,
+        )
+        timings.append(float(result.stdout))
+    return min(timings)
+
+
+def time_rerun(player: str, patch: str, runs: int = 20) -> tuple:
+    """Time of the first run for a player (network allowed) and average time
+    of the following reruns with network forbidden.
+    """
+    inputs = {"name": player, "patch": patch, "compare": False, "run": True}
+    cache = {}
+    _, first = run_app(inputs, cache)
+    with mock.patch(
+        "requests.Session.request",
+        side_effect=AssertionError("network request on the rerun path"),
+    ):
+        start = time.perf_counter()
+        for _ in range(runs):
+            run_app(inputs, cache)
+    return first, (time.perf_counter() - start) / runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--player", default="mind_control")
+    parser.add_argument("--patch", default="7.27")
+    args = parser.parse_args()
+
+    print(f"cold import: {time_cold_import() * 1000:.1f} ms ({', '.join(app_imports())})")
+    print(f"first paint: {time_first_paint() * 1000:.1f} ms")
+    first, rerun = time_rerun(args.player, args.patch)
+    print(f"first run:   {first * 1000:.1f} ms")
+    print(f"rerun:       {rerun * 1000:.1f} ms")
@@ -5,6 +5,22 @@ pd.options.mode.use_inf_as_na = True
 
 
 BASE_URL = "https://api.opendota.com/api/"
+# minimal pause between requests shared by all threads (OpenDota allows 60/min)
+requests_interval = 1.1
+http_pool_size = 16
+http_timeout = 30
+# failed requests (connection errors, 429 and 5xx) are retried after
+# http_backoff seconds, doubling the pause every attempt
+http_retries = 3
+http_backoff = 2.0
+# number of match ids requested from the explorer at once
+explorer_page_size = 1000
+# seconds constants (patches, heroes, pro players) are reused before refetch
+constants_ttl = 24 * 60 * 60
+# seconds a fetched player's data is shared between app sessions
+fetch_cache_ttl = 60 * 60
+# raw responses of parsed matches shared by all workers, sessions and runs
+match_cache_dir = "data/matches"
 
 required_data = [
     "match_id",
@@ -46,3 +62,59 @@ core_stats = [
     "is_roaming",
 ]
 supp_stats = None
+
+# dimensions and measures of the aggregate cube built over cleaned data
+cube_dimensions = ["hero", "patch", "side", "league", "lane"]
+cube_measures = [
+    "win",
+    "kda",
+    "kills",
+    "deaths",
+    "assists",
+    "gold_per_min",
+    "xp_per_min",
+    "lh_10",
+    "dn_10",
+    "nw_10",
+    "xp_10",
+    "gold_diff_10",
+    "xp_diff_10",
+]
+# compact per-player stats kept for all ten players in comparison mode
+lobby_stats = [
+    "match_id",
+    "account_id",
+    "player_slot",
+    "hero_id",
+    "lane",
+    "kills",
+    "deaths",
+    "assists",
+    "last_hits",
+    "denies",
+    "gold_per_min",
+    "xp_per_min",
+    "hero_damage",
+    "tower_damage",
+]
+# maximal number of points a single chart trace sends to the browser
+chart_point_budget = 500
+# features of cleaned data used to find similar games
+similarity_numeric = [
+    "lh_10",
+    "dn_10",
+    "nw_10",
+    "xp_10",
+    "gold_diff_10",
+    "xp_diff_10",
+    "duration",
+    "kda",
+    "kills",
+    "deaths",
+    "assists",
+]
+similarity_categorical = ["hero", "side", "lane"]
+# recent form: metrics over last N games and exponentially weighted
+form_metrics = ["win", "kda", "gold_per_min"]
+form_windows = [5, 10, 20]
+form_alphas = [0.1, 0.3]
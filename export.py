@@ -0,0 +1,123 @@
+"""Headless bulk export of cleaned players' data to Parquet partitioned by
+patch and player.
+
+python export.py players.txt --min-patch 7.27 --max-patch 7.28 --workers 8 --resume
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import shutil
+
+import pandas as pd
+
+from service.match_index import MatchIndex
+from service.player_data import PlayerData
+from service.query import CLEANING_STEPS, run_steps
+from utils.helpers import get_heroes_data, get_patches_data, get_pro_players
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("players", help="file with one player's name per line")
+    parser.add_argument("--min-patch", required=True, help="first patch, like 7.27")
+    parser.add_argument("--max-patch", help="last patch (defaults to the current one)")
+    parser.add_argument("--out", default="data/export", help="output directory")
+    parser.add_argument("--workers", type=int, default=4, help="players exported in parallel")
+    parser.add_argument("--resume", action="store_true", help="skip already exported players")
+    parser.add_argument("--profile", help="directory for per-stage profiles of every player")
+    return parser.parse_args(args)
+
+
+def read_players(path: str) -> list:
+    """Reads unique players' names skipping blank lines and # comments."""
+    with open(path) as file:
+        names = [line.strip() for line in file]
+    return list(dict.fromkeys(name for name in names if name and not name.startswith("#")))
+
+
+def export_player(name: str, args: argparse.Namespace, patches_data: list) -> int:
+    """Fetches, cleans and writes data of a single player. Returns number of
+    exported games.
+    """
+    out = Path(args.out)
+    player = PlayerData(
+        player=name,
+        min_patch=args.min_patch,
+        max_patch=args.max_patch,
+        patches_data=patches_data,
+        profile=str(Path(args.profile) / name) if args.profile else None,
+    )
+    player.get_player_id(
+    ).get_matches_data(
+    ).get_player_stats(
+    ).merge_player_data_with_match()
+    if player.rejected:
+        print(f"Quarantined matches of {name}: {player.rejection_report().to_dict()}")
+    if player.failed:
+        raise RuntimeError(f"failed to fetch {len(player.failed)} matches")
+
+    raw = MatchIndex(patches_data).add(player).between_patches(args.min_patch, args.max_patch)
+    data = run_steps(raw.copy(), CLEANING_STEPS, patches_data, player.profiler)
+    data = data.assign(player=name).convert_dtypes()
+    write_player(data, out, name)
+    return len(data)
+
+
+def write_player(data: pd.DataFrame, out: Path, name: str) -> None:
+    """Replaces player's partitions with new data and marks the player done.
+    Data is written to a staging directory first, so a failed write keeps
+    the previous export intact.
+    """
+    staging = out / "_staging" / name
+    shutil.rmtree(staging, ignore_errors=True)
+    if len(data):
+        data.to_parquet(staging, partition_cols=["patch", "player"], index=False)
+
+    for old_partition in out.glob(f"patch=*/player={name}"):
+        shutil.rmtree(old_partition)
+    for new_partition in staging.glob(f"patch=*/player={name}"):
+        target = out / new_partition.parent.name
+        target.mkdir(parents=True, exist_ok=True)
+        new_partition.rename(target / new_partition.name)
+    shutil.rmtree(staging, ignore_errors=True)
+
+    (out / "_done").mkdir(parents=True, exist_ok=True)
+    (out / "_done" / name).touch()
+
+
+def main(args=None) -> int:
+    args = parse_args(args)
+    players = read_players(args.players)
+    if args.resume:
+        done = Path(args.out) / "_done"
+        players = [name for name in players if not (done / name).exists()]
+    print(f"Exporting {len(players)} players with {args.workers} workers.")
+
+    # warm shared caches once before workers start using them
+    patches_data = get_patches_data()
+    get_heroes_data()
+    get_pro_players()
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(export_player, name, args, patches_data): name
+            for name in players
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                print(f"Exported {future.result()} games of {name}.")
+            except Exception as error:
+                failed.append(name)
+                print(f"Failed to export {name}: {error!r}")
+
+    if failed:
+        print(f"\n{len(failed)} players failed, rerun with --resume: {', '.join(failed)}")
+        return 1
+    print("\nExported everyone!")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
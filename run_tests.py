@@ -1,5 +1,5 @@
 import unittest
-from tests import test_getter
+from tests import test_getter, test_cube, test_query, test_singleflight, test_dashboard, test_rolling, test_comparison, test_match_index, test_export, test_curves, test_profiling, test_similarity, test_cleaner, test_validation, test_player_data, test_http, test_parsing
 
 
 # initialize the test suite
@@ -8,6 +8,22 @@ suite = unittest.TestSuite()
 
 # add tests to the test suite
 suite.addTests(loader.loadTestsFromModule(test_getter))
+suite.addTests(loader.loadTestsFromModule(test_cube))
+suite.addTests(loader.loadTestsFromModule(test_query))
+suite.addTests(loader.loadTestsFromModule(test_singleflight))
+suite.addTests(loader.loadTestsFromModule(test_dashboard))
+suite.addTests(loader.loadTestsFromModule(test_rolling))
+suite.addTests(loader.loadTestsFromModule(test_comparison))
+suite.addTests(loader.loadTestsFromModule(test_match_index))
+suite.addTests(loader.loadTestsFromModule(test_export))
+suite.addTests(loader.loadTestsFromModule(test_curves))
+suite.addTests(loader.loadTestsFromModule(test_profiling))
+suite.addTests(loader.loadTestsFromModule(test_similarity))
+suite.addTests(loader.loadTestsFromModule(test_cleaner))
+suite.addTests(loader.loadTestsFromModule(test_validation))
+suite.addTests(loader.loadTestsFromModule(test_player_data))
+suite.addTests(loader.loadTestsFromModule(test_http))
+suite.addTests(loader.loadTestsFromModule(test_parsing))
 
 # initialize a runner, pass it your suite and run it
 runner = unittest.TextTestRunner(verbosity=3)
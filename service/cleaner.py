@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import pandas as pd
-import requests
 
-from utils.helpers import id_to_name, negate
+from service.curves import advantage_matrix, padded_matrix
+from utils.helpers import get_heroes_data, id_to_name
 
 
 @dataclass
@@ -44,9 +44,7 @@ class DataCleaner:
 
     def clean_hero(self, data) -> pd.DataFrame:
         """Replaces ids with corresponding names of heroes."""
-        heroes_data = requests.get(
-            "http://api.opendota.com/api/constants/heroes"
-        ).json()
+        heroes_data = get_heroes_data()
         data["hero_id"] = data["hero_id"].apply(
             id_to_name, args=(heroes_data,)
         )
@@ -61,10 +59,14 @@ class DataCleaner:
         return data
 
     def clean_duration(self, data) -> pd.DataFrame:
-        """Replaces timestamp with normal duration."""
-        data["duration"] = pd.to_datetime(
-            data["duration"], unit="s"
-        ).dt.strftime("%M:%S")
+        """Replaces seconds with "minutes:seconds" duration. Minutes don't
+        wrap after an hour, so 75:03 stays 75:03.
+        """
+        seconds = data["duration"].astype("float")
+        minutes = (seconds // 60).map("{:02.0f}".format)
+        data["duration"] = (minutes + ":" + (seconds % 60).map("{:02.0f}".format)).where(
+            seconds.notna()
+        )
         return data
 
     def clean_kda(self, data) -> pd.DataFrame:
@@ -120,49 +122,49 @@ class DataCleaner:
 
     def clean_dn_t(self, data) -> pd.DataFrame:
         """Extracts values for 10-, 20- and 30-minute marks from a list into
-        new columns.
+        new columns, NaN for games that ended earlier.
         """
-        denies_per_time = data["dn_t"].apply(pd.Series)
+        denies_per_time = padded_matrix(data["dn_t"], min_width=30)
         data = data.drop(columns=["dn_t"]).assign(
-            dn_10=denies_per_time[9],
-            dn_20=denies_per_time[19],
-            dn_30=denies_per_time[29],
+            dn_10=denies_per_time[:, 9],
+            dn_20=denies_per_time[:, 19],
+            dn_30=denies_per_time[:, 29],
         )
         return data
 
     def clean_lh_t(self, data) -> pd.DataFrame:
         """Extracts values for 10-, 20- and 30-minute marks from a list into
-        new columns.
+        new columns, NaN for games that ended earlier.
         """
-        lh_per_time = data["lh_t"].apply(pd.Series)
+        lh_per_time = padded_matrix(data["lh_t"], min_width=30)
         data = data.drop(columns=["lh_t"]).assign(
-            lh_10=lh_per_time[9],
-            lh_20=lh_per_time[19],
-            lh_30=lh_per_time[29],
+            lh_10=lh_per_time[:, 9],
+            lh_20=lh_per_time[:, 19],
+            lh_30=lh_per_time[:, 29],
         )
         return data
 
     def clean_gold_t(self, data) -> pd.DataFrame:
         """Extracts values for 10-, 20- and 30-minute marks from a list into
-        new columns.
+        new columns, NaN for games that ended earlier.
         """
-        nw_per_time = data["gold_t"].apply(pd.Series)
+        nw_per_time = padded_matrix(data["gold_t"], min_width=30)
         data = data.drop(columns=["gold_t"]).assign(
-            nw_10=nw_per_time[9],
-            nw_20=nw_per_time[19],
-            nw_30=nw_per_time[29],
+            nw_10=nw_per_time[:, 9],
+            nw_20=nw_per_time[:, 19],
+            nw_30=nw_per_time[:, 29],
         )
         return data
 
     def clean_xp_t(self, data) -> pd.DataFrame:
         """Extracts values for 10-, 20- and 30-minute marks from a list into
-        new columns.
+        new columns, NaN for games that ended earlier.
         """
-        xp_per_time = data["xp_t"].apply(pd.Series)
+        xp_per_time = padded_matrix(data["xp_t"], min_width=30)
         data = data.drop(columns=["xp_t"]).assign(
-            xp_10=xp_per_time[9],
-            xp_20=xp_per_time[19],
-            xp_30=xp_per_time[29],
+            xp_10=xp_per_time[:, 9],
+            xp_20=xp_per_time[:, 19],
+            xp_30=xp_per_time[:, 29],
         )
         return data
 
@@ -171,17 +173,15 @@ class DataCleaner:
         new columns. Takes into consideration which side requested player
         played on.
         """
-        data.loc[
-            data.side == "Dire", "radiant_gold_adv"
-        ] = data["radiant_gold_adv"].apply(negate)
-
-        gold_diff_per_time = data["radiant_gold_adv"].apply(pd.Series)
+        gold_diff_per_time = advantage_matrix(
+            data, "radiant_gold_adv", min_width=30
+        )
 
         data = data.drop(
             columns=["radiant_gold_adv"]).assign(
-            gold_diff_10=gold_diff_per_time[9],
-            gold_diff_20=gold_diff_per_time[19],
-            gold_diff_30=gold_diff_per_time[29],
+            gold_diff_10=gold_diff_per_time[:, 9],
+            gold_diff_20=gold_diff_per_time[:, 19],
+            gold_diff_30=gold_diff_per_time[:, 29],
         )
         return data
 
@@ -190,28 +190,29 @@ class DataCleaner:
         new columns. Takes into consideration which side requested player
         played on.
         """
-        data.loc[
-            data.side == "Dire", "radiant_xp_adv"
-        ] = data["radiant_xp_adv"].apply(negate)
-
-        xp_diff_per_time = data["radiant_xp_adv"].apply(pd.Series)
+        xp_diff_per_time = advantage_matrix(
+            data, "radiant_xp_adv", min_width=30
+        )
 
         data = data.drop(
             columns=["radiant_xp_adv"]).assign(
-            xp_diff_10=xp_diff_per_time[9],
-            xp_diff_20=xp_diff_per_time[19],
-            xp_diff_30=xp_diff_per_time[29],
+            xp_diff_10=xp_diff_per_time[:, 9],
+            xp_diff_20=xp_diff_per_time[:, 19],
+            xp_diff_30=xp_diff_per_time[:, 29],
         )
         return data
 
     def convert_to_int(self, data) -> pd.DataFrame:
         """Converts appropriate columns to int."""
         to_int = [
-            "dire_score",
-            "radiant_score",
-            "pings",
-            "neutral_creeps",
-            "lane_creeps",
+            col for col in [
+                "dire_score",
+                "radiant_score",
+                "pings",
+                "neutral_creeps",
+                "lane_creeps",
+            ]
+            if col in data.columns
         ]
         data[to_int] = data[to_int].astype("int")
         return data
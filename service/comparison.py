@@ -0,0 +1,54 @@
+import pandas as pd
+
+from typing import List
+
+import config
+
+
+LOBBY_KEYS = ["match_id", "account_id", "player_slot", "hero_id", "lane"]
+
+
+def compare_to_lobby(lobby: pd.DataFrame,
+                     account_id: str,
+                     stats: List[str] = None) -> pd.DataFrame:
+    """Ranks the player against the other players of already fetched matches.
+
+    For every stat returns:
+    - <stat>_match_pct: percentile rank among all ten players of the match,
+    - <stat>_lane_pct: percentile rank among everyone in the same lane,
+    - <stat>_vs_lane: difference with the average of lane opponents,
+    - <stat>_hero_pct: percentile rank among all players on the same hero.
+    """
+    if stats is None:
+        stats = [s for s in config.lobby_stats if s not in LOBBY_KEYS]
+
+    lobby = lobby.assign(
+        is_radiant=lobby["player_slot"] < 128,
+        is_target=pd.to_numeric(lobby["account_id"], errors="coerce") == int(account_id),
+    )
+    values = lobby[stats].astype("float")
+
+    match_pct = values.groupby(lobby["match_id"]).rank(pct=True)
+    lane_pct = values.groupby([lobby["match_id"], lobby["lane"]]).rank(pct=True)
+    hero_pct = values.groupby(lobby["hero_id"]).rank(pct=True)
+
+    side_means = values.groupby(
+        [lobby["match_id"], lobby["lane"], lobby["is_radiant"]]
+    ).mean()
+    target = lobby[lobby["is_target"]]
+    opponents = pd.MultiIndex.from_arrays(
+        [target["match_id"], target["lane"], ~target["is_radiant"]]
+    )
+    vs_lane = values.loc[target.index] - side_means.reindex(opponents).to_numpy()
+
+    comparison = pd.concat(
+        [
+            target[["match_id", "hero_id", "lane"]],
+            match_pct.loc[target.index].add_suffix("_match_pct"),
+            lane_pct.loc[target.index].add_suffix("_lane_pct"),
+            vs_lane.add_suffix("_vs_lane"),
+            hero_pct.loc[target.index].add_suffix("_hero_pct"),
+        ],
+        axis=1,
+    )
+    return comparison.set_index("match_id")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import threading
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+import config
+
+
+@dataclass
+class AggregateCube:
+    """Materialized counts, sums and sums of squares of cleaned data grouped
+    by hero, patch, side, league and lane. Gets updated with new matches
+    instead of being rebuilt from scratch. Safe to share between sessions.
+    """
+
+    dimensions: List[str] = field(
+        default_factory=lambda: list(config.cube_dimensions)
+    )
+    measures: List[str] = field(
+        default_factory=lambda: list(config.cube_measures)
+    )
+    cells: pd.DataFrame = None
+    _seen: set = field(default_factory=set, repr=False)
+    _answers: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _prepare(self, data) -> pd.DataFrame:
+        """Keeps dimensions and numeric measures of cleaned data."""
+        measures = [m for m in self.measures if m in data.columns]
+        prepared = data[self.dimensions + measures].copy()
+        prepared[self.dimensions] = prepared[self.dimensions].fillna("unknown")
+        if "win" in measures and prepared["win"].dtype == object:
+            prepared["win"] = (prepared["win"] == "Win").astype("float")
+        prepared[measures] = prepared[measures].astype("float")
+        return prepared
+
+    def update(self, data) -> AggregateCube:
+        """Adds cleaned matches to the cube. Matches it already holds are
+        skipped, so a refreshed frame can be passed as a whole.
+        """
+        with self._lock:
+            data = data[~data["match_id"].isin(self._seen)].drop_duplicates(subset=["match_id"])
+            if data.empty:
+                return self
+            self._seen.update(data["match_id"])
+            prepared = self._prepare(data)
+            measures = prepared.columns.drop(self.dimensions)
+            keys = [prepared[d] for d in self.dimensions]
+            values = prepared[measures]
+
+            new_cells = pd.concat(
+                {
+                    "count": values.notna().groupby(keys).sum(),
+                    "sum": values.groupby(keys).sum(),
+                    "sumsq": (values ** 2).groupby(keys).sum(),
+                },
+                axis=1,
+            )
+            if self.cells is None:
+                self.cells = new_cells
+            else:
+                self.cells = self.cells.add(new_cells, fill_value=0)
+            self._answers.clear()
+            return self
+
+    def query(self, measure: str, by: List[str] = None, **filters) -> pd.DataFrame:
+        """Returns count, mean and standard deviation of a measure grouped by
+        given dimensions. Filters are dimension values or lists of them.
+        Answers are memoized until the next update.
+        """
+        by = list(by or [])
+        with self._lock:
+            return self._query(measure, by, filters)
+
+    def _query(self, measure: str, by: List[str], filters: dict) -> pd.DataFrame:
+        key = (
+            measure,
+            tuple(by),
+            tuple(sorted((d, str(v)) for d, v in filters.items())),
+        )
+        if key in self._answers:
+            return self._answers[key]
+
+        cells = self.cells
+        if cells is None:
+            index = pd.MultiIndex.from_arrays([[]] * len(by), names=by) if by else []
+            return pd.DataFrame(
+                {"count": pd.Series(dtype="int"), "mean": pd.Series(dtype="float"),
+                 "std": pd.Series(dtype="float")},
+                index=index,
+            )
+        for dimension, value in filters.items():
+            level = cells.index.get_level_values(dimension)
+            if isinstance(value, (list, tuple, set)):
+                cells = cells[level.isin(value)]
+            else:
+                cells = cells[level == value]
+
+        stats = cells[[("count", measure), ("sum", measure), ("sumsq", measure)]]
+        stats.columns = ["count", "sum", "sumsq"]
+        if by:
+            stats = stats.groupby(level=by).sum()
+        else:
+            stats = stats.sum().to_frame("all").T
+
+        count = stats["count"].to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = stats["sum"].to_numpy() / count
+            variance = (stats["sumsq"].to_numpy() / count - mean ** 2).clip(min=0)
+            std = np.sqrt(variance * count / (count - 1))
+
+        answer = pd.DataFrame(
+            {"count": count.astype("int"), "mean": mean, "std": std},
+            index=stats.index,
+        )
+        self._answers[key] = answer
+        return answer
+
+    def winrate(self, by: List[str] = None, **filters) -> pd.DataFrame:
+        """Returns number of games and winrate grouped by given dimensions."""
+        answer = self.query("win", by, **filters)
+        return answer[["count", "mean"]].rename(
+            columns={"count": "games", "mean": "winrate"}
+        )
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from typing import List, Sequence
+
+
+def player_sides(data: pd.DataFrame) -> np.ndarray:
+    """Returns True for games the player played on Dire."""
+    if "side" in data.columns:
+        return (data["side"] == "Dire").to_numpy()
+    return (data["player_slot"] >= 128).to_numpy()
+
+
+def padded_matrix(lists: Sequence, min_width: int = 0) -> np.ndarray:
+    """Loads per-minute lists into a (matches x minutes) matrix padded with
+    NaN to the longest list, but at least to min_width minutes.
+    """
+    values = [v if isinstance(v, list) else [] for v in lists]
+    lengths = np.array([len(v) for v in values], dtype="int")
+    width = max(int(lengths.max()) if len(lengths) else 0, min_width)
+
+    matrix = np.full((len(values), width), np.nan)
+    filled = np.arange(width) < lengths[:, None]
+    if filled.any():
+        matrix[filled] = np.concatenate(values)
+    return matrix
+
+
+def advantage_matrix(data: pd.DataFrame, column: str, min_width: int = 0) -> np.ndarray:
+    """Loads per-minute radiant advantage lists into a (matches x minutes)
+    matrix padded with NaN and flipped to the player's side.
+    """
+    matrix = padded_matrix(data[column], min_width)
+    matrix[player_sides(data)] *= -1
+    return matrix
+
+
+def curve_stats(data: pd.DataFrame,
+                column: str,
+                by: List[str] = None,
+                percentiles: Sequence[float] = (25, 75)) -> pd.DataFrame:
+    """Returns mean, median and percentile bands of an advantage curve for
+    every minute, grouped by given columns (like hero, patch or side).
+    Result is in long format, ready for plotly express.
+    """
+    data = data.reset_index(drop=True)
+    matrix = advantage_matrix(data, column)
+    by = list(by or [])
+    stats = ["mean", "median"] + [f"p{q:g}" for q in percentiles]
+    if by:
+        grouped = data.groupby(by)
+        codes = grouped.ngroup().fillna(-1).to_numpy().astype("int")
+        keys = pd.DataFrame(list(grouped.size().index), columns=by)
+    else:
+        codes = np.zeros(len(data), dtype="int")
+        keys = pd.DataFrame(index=[0])
+    # rows with missing group values don't belong to any group
+    matrix, codes = matrix[codes >= 0], codes[codes >= 0]
+    if not len(codes) or not matrix.shape[1]:
+        return pd.DataFrame(columns=by + ["minute", "games"] + stats)
+
+    # sort rows by group and, within every group, each minute's values with
+    # NaN last, so every group is a contiguous segment of sorted columns
+    ranks = np.where(np.isnan(matrix), np.inf, matrix).argsort(axis=0).argsort(axis=0)
+    order = (codes[:, None] * len(codes) + ranks).argsort(axis=0)
+    ordered = np.take_along_axis(matrix, order, axis=0)
+    sizes = np.bincount(codes, minlength=len(keys))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    present = ~np.isnan(ordered)
+    games = np.add.reduceat(present.astype("int"), starts, axis=0)
+    totals = np.add.reduceat(np.where(present, ordered, 0), starts, axis=0)
+    with np.errstate(invalid="ignore"):
+        values = [totals / games]
+    for q in [50] + list(percentiles):
+        # linear interpolation between closest ranks, like np.nanpercentile
+        position = np.maximum(games - 1, 0) * q / 100
+        low = np.floor(position).astype("int")
+        high = np.ceil(position).astype("int")
+        low_value = np.take_along_axis(ordered, starts[:, None] + low, axis=0)
+        high_value = np.take_along_axis(ordered, starts[:, None] + high, axis=0)
+        values.append(low_value + (high_value - low_value) * (position - low))
+
+    n_groups, width = games.shape
+    group = np.repeat(np.arange(n_groups), width)
+    result = keys.iloc[group].reset_index(drop=True).assign(
+        minute=np.tile(np.arange(width), n_groups),
+        games=games.ravel(),
+        **{name: value.ravel() for name, value in zip(stats, values)},
+    )
+    return result[result["games"] > 0].reset_index(drop=True)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+import config
+from service.cube import AggregateCube
+from service.curves import curve_stats
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling. Returns sorted indices of
+    at most threshold points keeping the visual shape of the series.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float")
+    y = np.asarray(y, dtype="float")
+    edges = np.linspace(1, n - 1, threshold - 1).astype("int")
+    selected = np.empty(threshold, dtype="int")
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(data: pd.DataFrame,
+               x: str,
+               y: str,
+               by: str = None,
+               budget: int = None) -> pd.DataFrame:
+    """Downsamples a timeseries (per group, sharing the budget) to a fixed
+    number of points before it's sent to the browser. A trace needs at least
+    3 points, so with more groups than that allows only the largest are kept.
+    """
+    budget = budget or config.chart_point_budget
+    data = data.dropna(subset=[x, y]).sort_values(x)
+    groups = [data] if by is None else [group for _, group in data.groupby(by)]
+    if len(groups) > max(budget // 3, 1):
+        groups = sorted(groups, key=len, reverse=True)[:max(budget // 3, 1)]
+    per_group = max(budget // max(len(groups), 1), 3)
+
+    sampled = []
+    for group in groups:
+        x_values = group[x]
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            x_values = x_values.astype("int64")
+        rows = lttb(x_values.to_numpy(), group[y].to_numpy(), per_group)
+        sampled.append(group.iloc[rows])
+    return pd.concat(sampled) if sampled else data
+
+
+def winrate_figure(cube: AggregateCube, by: str = "hero", top: int = 30, **filters):
+    """Bar chart of winrate by a cube dimension, most played first."""
+    import plotly.express as px
+
+    winrate = cube.winrate(by=[by], **filters).sort_values("games", ascending=False).head(top)
+    return px.bar(
+        winrate.reset_index(), x=by, y="winrate", hover_data=["games"],
+        range_y=[0, 1],
+    )
+
+
+def curve_figure(data: pd.DataFrame, column: str = "radiant_gold_adv", by: List[str] = None):
+    """Median advantage curve with interquartile band for raw player data."""
+    import plotly.graph_objects as go
+
+    curves = curve_stats(data, column, by=by)
+    figure = go.Figure()
+    groups = [((), curves)] if not by else curves.groupby(by)
+    for key, curve in groups:
+        name = " ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+        figure.add_trace(go.Scatter(
+            x=np.concatenate([curve["minute"], curve["minute"][::-1]]),
+            y=np.concatenate([curve["p75"], curve["p25"][::-1]]),
+            fill="toself", opacity=0.2, line={"width": 0},
+            showlegend=False, hoverinfo="skip", name=name,
+        ))
+        figure.add_trace(go.Scatter(
+            x=curve["minute"], y=curve["median"], mode="lines", name=name or "median",
+        ))
+    figure.update_layout(xaxis_title="minute", yaxis_title=column)
+    return figure
+
+
+def timeseries_figure(data: pd.DataFrame, y: str, x: str = "start_time",
+                      by: str = None, budget: int = None):
+    """Scatter of a per-game stat over time, downsampled to the point budget."""
+    import plotly.express as px
+
+    data = data.assign(**{x: pd.to_datetime(data[x])})
+    return px.scatter(downsample(data, x, y, by=by, budget=budget), x=x, y=y, color=by)
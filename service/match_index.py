@@ -0,0 +1,147 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+import config
+from service.player_data import PatchDict, PlayerData
+
+
+def to_timestamp(date) -> int:
+    """Converts a date (string, datetime or unix seconds) to unix seconds."""
+    if isinstance(date, (int, np.integer)):
+        return int(date)
+    return pd.to_datetime(date, utc=True).value // 10 ** 9
+
+
+@dataclass
+class Snapshot:
+    """Sorted matches with arrays searched over them, swapped as a whole so
+    readers never mix data and offsets of different versions.
+    """
+
+    data: pd.DataFrame
+    lobby_stats: pd.DataFrame
+    start_times: np.ndarray
+    id_order: np.ndarray
+    match_ids: np.ndarray
+
+
+@dataclass
+class MatchIndex:
+    """Player's already fetched matches sorted by start time (and match id)
+    to answer date and patch range queries with binary search instead of
+    refetching data. Data older than ttl seconds is due for a refresh.
+    """
+
+    patches_data: List[PatchDict]
+    player_id: str = None
+    covered_from: int = None
+    refreshed_at: float = None
+    ttl: float = field(default_factory=lambda: config.fetch_cache_ttl)
+    _snapshot: Snapshot = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self._patch_names = [patch["name"] for patch in self.patches_data]
+        self._patch_starts = np.array(
+            [to_timestamp(patch["date"]) for patch in self.patches_data]
+        )
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._snapshot.data if self._snapshot else None
+
+    @property
+    def lobby_stats(self) -> pd.DataFrame:
+        return self._snapshot.lobby_stats if self._snapshot else None
+
+    def patch_bounds(self, first: str, last: str = None) -> tuple:
+        """Returns start time of the first patch and start time of the patch
+        after the last one (None if the last one is the current patch).
+        """
+        try:
+            start = self._patch_names.index(str(first))
+            end = self._patch_names.index(str(last)) if last else len(self._patch_names) - 1
+        except ValueError:
+            raise ValueError(f"Unknown patch: {first} - {last}")
+        end_time = (
+            self._patch_starts[end + 1] if end + 1 < len(self._patch_starts) else None
+        )
+        return self._patch_starts[start], end_time
+
+    def add(self, player: PlayerData) -> MatchIndex:
+        """Adds matches fetched starting from player's min_patch."""
+        covered_from, _ = self.patch_bounds(player.min_patch)
+        with self._lock:
+            old = self._snapshot
+            data = self._merge(old and old.data, player.player_data)
+            lobby_stats = old and old.lobby_stats
+            if player.lobby_stats is not None:
+                lobby_stats = self._merge(
+                    lobby_stats, player.lobby_stats, keys=["match_id", "player_slot"]
+                )
+            id_order = np.argsort(data["match_id"].to_numpy(), kind="stable")
+            self._snapshot = Snapshot(
+                data=data,
+                lobby_stats=lobby_stats,
+                start_times=data["start_time"].to_numpy(),
+                id_order=id_order,
+                match_ids=data["match_id"].to_numpy()[id_order],
+            )
+            self.player_id = player.player_id
+            if self.covered_from is None or covered_from < self.covered_from:
+                self.covered_from = covered_from
+            self.refreshed_at = time.monotonic()
+        return self
+
+    @staticmethod
+    def _merge(old, new, keys=("match_id",)) -> pd.DataFrame:
+        merged = new if old is None else pd.concat([old, new])
+        merged = merged.drop_duplicates(subset=list(keys), keep="last")
+        if "start_time" in merged.columns:
+            merged = merged.sort_values(["start_time", "match_id"], kind="mergesort")
+        return merged.reset_index(drop=True)
+
+    def covers(self, min_patch: str) -> bool:
+        """Whether all matches starting from the patch are already held and
+        recent enough not to need a refresh.
+        """
+        if self.covered_from is None:
+            return False
+        if self.ttl is not None and time.monotonic() - self.refreshed_at >= self.ttl:
+            return False
+        start, _ = self.patch_bounds(min_patch)
+        return start >= self.covered_from
+
+    def between_dates(self, start=None, end=None) -> pd.DataFrame:
+        """Returns matches started from start up to (not including) end."""
+        snapshot = self._snapshot
+        first = 0 if start is None else np.searchsorted(
+            snapshot.start_times, to_timestamp(start), side="left"
+        )
+        last = len(snapshot.start_times) if end is None else np.searchsorted(
+            snapshot.start_times, to_timestamp(end), side="left"
+        )
+        return snapshot.data.iloc[first:last]
+
+    def between_patches(self, first: str, last: str = None) -> pd.DataFrame:
+        """Returns matches played on patches from first to last inclusive."""
+        start, end = self.patch_bounds(first, last)
+        return self.between_dates(start, end)
+
+    def between_match_ids(self, first: int, last: int) -> pd.DataFrame:
+        """Returns matches with ids from first to last inclusive."""
+        snapshot = self._snapshot
+        lo = np.searchsorted(snapshot.match_ids, first, side="left")
+        hi = np.searchsorted(snapshot.match_ids, last, side="right")
+        return snapshot.data.iloc[np.sort(snapshot.id_order[lo:hi])]
+
+    def lobby_for(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Returns lobby stats of given matches."""
+        lobby_stats = self.lobby_stats
+        return lobby_stats[lobby_stats["match_id"].isin(data["match_id"])]
@@ -3,13 +3,18 @@ from dataclasses import dataclass, field
 import pandas as pd
 import requests
 from requests.utils import quote
-import time
 
-from typing import List
+from typing import Iterator, List
 from typing_extensions import TypedDict
 
 import config
-from utils.helpers import get_current_patch, get_patches_data
+from utils import http
+from utils.helpers import get_current_patch, get_patches_data, get_pro_players
+from utils.match_cache import MatchCache
+from utils.parsing import parse_match
+from utils.profiling import Profiler, make_profiler, maybe_accumulate, profiled
+from utils.singleflight import SingleFlight
+from utils.validation import validate_match
 
 
 class PatchDict(TypedDict):
@@ -26,6 +31,7 @@ class PlayerData:
 
     player: str
     min_patch: str = None
+    max_patch: str = None
     player_id: str = None
     match_ids: List[int] = None
     patches_data: List[PatchDict] = field(
@@ -34,16 +40,30 @@ class PlayerData:
     matches_data: pd.DataFrame = None
     player_stats: pd.DataFrame = None
     player_data: pd.DataFrame = None
+    keep_lobby: bool = False
+    lobby_stats: pd.DataFrame = None
+    rejected: List[dict] = field(default_factory=list)
+    failed: List[dict] = field(default_factory=list)
+    match_fields: List[str] = field(
+        default_factory=lambda: list(config.required_data)
+    )
+    player_fields: List[str] = field(
+        default_factory=lambda: list(config.core_stats)
+    )
+    profile: str = None
+    profiler: Profiler = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
         if self.min_patch is None:
             self.min_patch = get_current_patch(self.patches_data)
+        self.profiler = make_profiler(self.profile)
 
+    @profiled
     def get_player_id(self) -> PlayerData:
         """Gets a player's id to ease communication with API."""
         print("\nGanking player's id.")
 
-        data = requests.get(config.BASE_URL + "proPlayers").json()
+        data = get_pro_players()
         self.player_id = str(
             next(
                 player["account_id"]
@@ -54,85 +74,207 @@ class PlayerData:
         print("Got it!")
         return self
 
+    def iter_match_ids(self, page_size: int = None) -> Iterator[int]:
+        """Yields ids of all played matches by the player page by page, using
+        keyset pagination on match_id, so fetching can start right away.
+        """
+        page_size = page_size or config.explorer_page_size
+        max_patch = (
+            f"AND match_patch.patch <= cast({self.max_patch} as varchar)"
+            if self.max_patch else ""
+        )
+        last_id = 0
+        while True:
+            query = f"""
+            SELECT
+            matches.match_id
+            FROM matches
+            JOIN match_patch using(match_id)
+            JOIN player_matches using(match_id)
+            WHERE TRUE
+            AND match_patch.patch >= cast({self.min_patch} as varchar)
+            {max_patch}
+            AND player_matches.account_id = {self.player_id}
+            AND matches.match_id > {last_id}
+            ORDER BY matches.match_id
+            LIMIT {page_size}
+            """
+
+            query = quote(query)
+            with maybe_accumulate(self.profiler, "explorer"):
+                rows = http.get(config.BASE_URL + f"explorer?sql={query}").json()["rows"]
+            for row in rows:
+                yield row.get("match_id")
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["match_id"]
+
+    @profiled
     def get_match_ids(self) -> PlayerData:
         """Gets ids for all played matches by the player based on provided
         query. We need those to request parsed data from each.
         """
         print(f"\nRaiding OpenDota for {self.player} match ids.")
-
-        query = f"""
-        SELECT
-        matches.match_id
-        FROM matches
-        JOIN match_patch using(match_id)
-        JOIN player_matches using(match_id)
-        LEFT JOIN notable_players ON
-        notable_players.account_id = player_matches.account_id
-        LEFT JOIN teams using(team_id)
-        WHERE TRUE
-        AND match_patch.patch >= cast({self.min_patch} as varchar)
-        AND player_matches.account_id = {self.player_id}
-        ORDER BY matches.match_id NULLS LAST
-        """
-
-        query = quote(query)
-        data = requests.get(config.BASE_URL + f"explorer?sql={query}").json()
-        match_ids = []
-        for row in data["rows"]:
-            match_ids.append(row.get("match_id"))
-        self.match_ids = match_ids
+        self.match_ids = list(self.iter_match_ids())
+        if self.profiler is not None:
+            self.profiler.flush()
         print(f"Got those too! Whooping {len(self.match_ids)} matches!")
         return self
 
+    @profiled
     def get_matches_data(self) -> PlayerData:
-        """Gets parsed data for every match id."""
+        """Gets parsed data for every match id. Only required match fields
+        and the requested player's entry are kept from each response, and
+        matches breaking the schema are quarantined in rejected. Matches
+        that couldn't be fetched are kept in failed.
+        If match ids weren't requested beforehand, they are discovered page
+        by page while matches are being fetched. With a profiler, explorer
+        requests, match requests, parsing and validation are profiled as
+        separate stages accumulated over all matches.
+        """
         print("\nFarming dat OpenDota's match data...")
 
+        if self.match_ids is None:
+            self.match_ids = []
+            match_ids = self.iter_match_ids()
+        else:
+            match_ids = self.match_ids
+
         matches_data = []
-        for match_id in self.match_ids:
-            time.sleep(1.1)
-            matches_data.append(
-                requests.get(config.BASE_URL + "matches/" + str(match_id)).json()
-            )
-        self.matches_data = pd.DataFrame(matches_data)[config.required_data]
-        print(f"Looted data on all {len(self.matches_data)} matches.")
+        for match_id in match_ids:
+            if match_ids is not self.match_ids:
+                self.match_ids.append(match_id)
+            try:
+                raw, cached = self._fetch_match(match_id)
+                match, reason = self._check_match(raw)
+                if reason is not None and cached:
+                    # only complete matches are cached, so the copy is stale
+                    match_cache.delete(match_id)
+                    raw, cached = self._fetch_match(match_id)
+                    match, reason = self._check_match(raw)
+            except (requests.RequestException, ValueError) as error:
+                self.failed.append({"match_id": match_id, "error": repr(error)})
+                continue
+            if reason is None:
+                if not cached and self._is_complete(raw):
+                    match_cache.put(match_id, raw)
+                matches_data.append(match)
+            else:
+                self.rejected.append({"match_id": match_id, "reason": reason})
+        if self.profiler is not None:
+            self.profiler.flush()
+        columns = self.match_fields + (["lobby"] if self.keep_lobby else [])
+        self.matches_data = pd.DataFrame(matches_data, columns=columns)
+        print(f"Looted data on {len(self.matches_data)} matches, "
+              f"quarantined {len(self.rejected)} unparsed or broken ones, "
+              f"failed to fetch {len(self.failed)}.")
+        return self
+
+    def _fetch_match(self, match_id: int) -> tuple:
+        with maybe_accumulate(self.profiler, "fetch_match"):
+            return fetch_match(match_id)
 
-        self.matches_data = self.matches_data.dropna(
-            subset=["match_id", "players"]
+    def _check_match(self, raw: bytes) -> tuple:
+        """Returns projected match and its rejection reason (None if valid)."""
+        with maybe_accumulate(self.profiler, "parse_match"):
+            match = parse_match(
+                raw,
+                self.match_fields,
+                self.player_fields,
+                self.player_id,
+                config.lobby_stats if self.keep_lobby else None,
             )
-        print(f"Looking for rows without match_id or players' data. {len(self.matches_data)} games left.")
-        return self
+        with maybe_accumulate(self.profiler, "validate_match"):
+            reason = validate_match(match, self.match_fields, self.player_fields)
+        return match, reason
+
+    def _is_complete(self, raw: bytes) -> bool:
+        """Whether a valid match has everything any query may ask for, so
+        it's safe to share through the cache.
+        """
+        if set(config.required_data) <= set(self.match_fields) and set(
+            config.core_stats
+        ) <= set(self.player_fields):
+            return True
+        match = parse_match(raw, config.required_data, config.core_stats, self.player_id)
+        return validate_match(match, config.required_data, config.core_stats) is None
 
+    @profiled
     def get_player_stats(self) -> PlayerData:
         """Extracts data on a required player from all games and creates a
         DataFrame with it.
         """
-        player_df = pd.DataFrame()
-
-        games = list(range(len(self.matches_data)))
-        print("\nBuilding DataFrames for every match...")
-        dfs = {
-            game: pd.DataFrame(self.matches_data.players.iloc[game])
-            for game in games
-        }
-
-        print(f"Drafting {self.player}-only DataFrame...")
-        for game, df in dfs.items():
-            player_df = pd.concat([player_df, df])
-        player_df = player_df[player_df.account_id.isin([self.player_id])]
-
-        print("Dropping unnecessary columns...")
-        self.player_stats = player_df[config.core_stats]
+        print(f"\nDrafting {self.player}-only DataFrame...")
+        self.player_stats = pd.DataFrame(
+            [player for players in self.matches_data.players for player in players],
+            columns=self.player_fields,
+        )
+        if self.keep_lobby:
+            print("Keeping compact stats of the whole lobby...")
+            self.lobby_stats = pd.DataFrame(
+                [player for lobby in self.matches_data.lobby for player in lobby],
+                columns=config.lobby_stats,
+            )
         print("All good!")
         return self
 
+    @profiled
     def merge_player_data_with_match(self) -> PlayerData:
         """Merges extracted player's data with match-level stats."""
         print("\nStacking player-specific data with general match data...")
 
         self.player_data = self.player_stats.merge(
-            self.matches_data.drop(columns=["players"]), on="match_id"
+            self.matches_data.drop(columns=["players", "lobby"], errors="ignore"),
+            on="match_id",
         )
-        self.player_data = self.player_data.dropna()
-        print(f"Dropped some more: {len(self.player_data)} games left!")
+        print(f"Got {len(self.player_data)} games!")
         return self
+
+    def rejection_report(self) -> pd.Series:
+        """Returns number of quarantined matches per rejection reason."""
+        reasons = pd.Series([match["reason"] for match in self.rejected], dtype="object")
+        return reasons.value_counts()
+
+
+# raw match responses shared by all players, workers and sessions
+match_cache = MatchCache(config.match_cache_dir)
+# concurrent requests of the same match wait for a single fetch
+match_fetches = SingleFlight(ttl=0)
+
+
+def fetch_match(match_id: int) -> tuple:
+    """Returns raw match response from the shared cache or OpenDota and
+    whether it came from the cache.
+    """
+
+    def fetch():
+        raw = match_cache.get(match_id)
+        if raw is not None:
+            return raw, True
+        return http.get(config.BASE_URL + "matches/" + str(match_id)).content, False
+
+    return match_fetches.do(match_id, fetch)
+
+
+# shared by all sessions of the app, so identical fetches run only once
+player_fetches = SingleFlight(ttl=config.fetch_cache_ttl)
+
+
+def fetch_player_data(player: str,
+                      min_patch: str,
+                      keep_lobby: bool = False) -> PlayerData:
+    """Acquires player's data from OpenDota. Concurrent calls for the same
+    player and patch wait for one fetch and share its result.
+    """
+
+    def fetch():
+        player_data = PlayerData(
+            player=player, min_patch=min_patch, keep_lobby=keep_lobby
+        )
+        player_data.get_player_id(
+        ).get_matches_data(
+        ).get_player_stats(
+        ).merge_player_data_with_match()
+        return player_data
+
+    return player_fetches.do((player.lower(), min_patch, keep_lobby), fetch)
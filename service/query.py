@@ -0,0 +1,168 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import pandas as pd
+
+from typing import List
+
+import config
+from service.cleaner import DataCleaner
+from service.player_data import PlayerData
+from utils.profiling import Profiler, maybe_stage
+
+
+@dataclass
+class Step:
+    """Cleaning step of DataCleaner with columns it reads and produces."""
+
+    name: str
+    inputs: List[str]
+    outputs: List[str]
+    needs_patches: bool = False
+    # inputs the step renames or drops, so they can't be selected with it
+    replaces: List[str] = field(default_factory=list)
+
+
+# cleaning steps in the order they have to be run
+CLEANING_STEPS = [
+    Step("clean_patch", ["patch"], ["patch"], needs_patches=True),
+    Step("clean_team", ["radiant_team", "dire_team"], ["radiant_team", "dire_team"]),
+    Step("clean_league", ["league"], ["league"]),
+    Step("clean_hero", ["hero_id"], ["hero"], replaces=["hero_id"]),
+    Step("clean_win", ["win"], ["win"]),
+    Step("clean_start_time", ["start_time"], ["start_time"]),
+    Step("clean_duration", ["duration"], ["duration"]),
+    Step("clean_kda", ["kills", "assists", "deaths"], ["kda"]),
+    Step("clean_roaming", ["is_roaming"], ["is_roaming"]),
+    Step("clean_player_slot", ["player_slot"], ["side"], replaces=["player_slot"]),
+    Step("clean_dn_t", ["dn_t"], ["dn_10", "dn_20", "dn_30"], replaces=["dn_t"]),
+    Step("clean_lh_t", ["lh_t"], ["lh_10", "lh_20", "lh_30"], replaces=["lh_t"]),
+    Step("clean_gold_t", ["gold_t"], ["nw_10", "nw_20", "nw_30"], replaces=["gold_t"]),
+    Step("clean_xp_t", ["xp_t"], ["xp_10", "xp_20", "xp_30"], replaces=["xp_t"]),
+    Step("clean_lane", ["lane"], ["lane"]),
+    Step(
+        "clean_lane_neutral_kills",
+        ["lane_kills", "neutral_kills"],
+        ["lane_creeps", "neutral_creeps"],
+        replaces=["lane_kills", "neutral_kills"],
+    ),
+    Step("convert_to_int", [], []),
+    Step("get_highest_streak", ["kill_streaks"], ["highest_ks"], replaces=["kill_streaks"]),
+    Step(
+        "clean_xp_adv",
+        ["radiant_xp_adv", "side"],
+        ["xp_diff_10", "xp_diff_20", "xp_diff_30"],
+        replaces=["radiant_xp_adv"],
+    ),
+    Step(
+        "clean_gold_adv",
+        ["radiant_gold_adv", "side"],
+        ["gold_diff_10", "gold_diff_20", "gold_diff_30"],
+        replaces=["radiant_gold_adv"],
+    ),
+]
+# steps without outputs are cheap fix-ups run on whatever columns are present
+ALWAYS_RUN = ["convert_to_int"]
+
+
+def run_steps(data,
+              steps: List[Step],
+              patches_data: list,
+              profiler: Profiler = None) -> pd.DataFrame:
+    """Runs given cleaning steps over raw player data, profiling each of
+    them if a profiler is given.
+    """
+    cleaner = DataCleaner()
+    for step in steps:
+        args = (patches_data,) if step.needs_patches else ()
+        with maybe_stage(profiler, step.name):
+            data = data.pipe(getattr(cleaner, step.name), *args)
+    return data
+
+
+@dataclass
+class QueryPlan:
+    """Minimal raw fields and cleaning steps needed for requested columns."""
+
+    match_fields: List[str]
+    player_fields: List[str]
+    steps: List[Step]
+
+
+@dataclass
+class Query:
+    """Lazy front-end to PlayerData and DataCleaner. Records requested
+    output columns and only fetches and cleans what they depend on.
+    """
+
+    player: str
+    min_patch: str = None
+    columns: List[str] = None
+    profile: str = None
+
+    def select(self, *columns: str) -> Query:
+        """Adds columns to the output. Without any, every column is kept."""
+        self.columns = (self.columns or []) + list(columns)
+        return self
+
+    def plan(self) -> QueryPlan:
+        """Works out raw fields and cleaning steps for requested columns."""
+        if not self.columns:
+            return QueryPlan(
+                list(config.required_data), list(config.core_stats), CLEANING_STEPS
+            )
+
+        used_steps = set()
+        raw = {"match_id"}
+
+        def resolve(column, before):
+            for index in range(before - 1, -1, -1):
+                step = CLEANING_STEPS[index]
+                if column in step.outputs:
+                    used_steps.add(index)
+                    for dependency in step.inputs:
+                        resolve(dependency, index)
+                    return
+            if column not in config.required_data + config.core_stats:
+                raise ValueError(f"Unknown column: {column}")
+            raw.add(column)
+
+        for column in self.columns:
+            resolve(column, len(CLEANING_STEPS))
+
+        steps = [
+            step for index, step in enumerate(CLEANING_STEPS)
+            if index in used_steps or step.name in ALWAYS_RUN
+        ]
+        for step in steps:
+            clashing = [c for c in step.replaces if c in self.columns]
+            if clashing:
+                raise ValueError(
+                    f"Can't select {', '.join(clashing)} together with "
+                    f"{', '.join(step.outputs)}: {step.name} replaces it"
+                )
+        match_fields = [f for f in config.required_data if f in raw or f == "players"]
+        player_fields = [f for f in config.core_stats if f in raw]
+        return QueryPlan(match_fields, player_fields, steps)
+
+    def collect(self) -> pd.DataFrame:
+        """Fetches and cleans data according to the plan."""
+        plan = self.plan()
+        player = PlayerData(
+            player=self.player,
+            min_patch=self.min_patch,
+            match_fields=plan.match_fields,
+            player_fields=plan.player_fields,
+            profile=self.profile,
+        )
+
+        player.get_player_id(
+        ).get_matches_data(
+        ).get_player_stats(
+        ).merge_player_data_with_match()
+
+        data = run_steps(
+            player.player_data.copy(), plan.steps, player.patches_data, player.profiler
+        )
+        if self.columns:
+            data = data[list(dict.fromkeys(self.columns))]
+        return data
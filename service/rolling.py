@@ -0,0 +1,127 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+import config
+
+
+@dataclass
+class RollingForm:
+    """Recent form of a player: metrics over the last N games and their
+    exponentially weighted averages, kept as running sums. Each appended
+    game costs O(1) per window, and the state can be saved, so refreshes
+    never rescan history. Safe to share between sessions.
+    """
+
+    metrics: List[str] = field(default_factory=lambda: list(config.form_metrics))
+    windows: List[int] = field(default_factory=lambda: list(config.form_windows))
+    alphas: List[float] = field(default_factory=lambda: list(config.form_alphas))
+    games: int = 0
+    last_seen: list = None
+    history: deque = None
+    sums: np.ndarray = None
+    counts: np.ndarray = None
+    ewm: np.ndarray = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        width = len(self.metrics)
+        self.history = deque(
+            (np.asarray(values, dtype="float") for values in self.history or []),
+            maxlen=max(self.windows),
+        )
+        if self.sums is None:
+            self.sums = np.zeros((len(self.windows), width))
+            self.counts = np.zeros((len(self.windows), width))
+            self.ewm = np.full((len(self.alphas), width), np.nan)
+        else:
+            self.sums = np.asarray(self.sums, dtype="float")
+            self.counts = np.asarray(self.counts, dtype="float")
+            self.ewm = np.asarray(self.ewm, dtype="float")
+
+    def append(self, values: np.ndarray) -> RollingForm:
+        """Adds a single game's metrics (missing ones as NaN)."""
+        values = np.asarray(values, dtype="float")
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0)
+
+        for row, window in enumerate(self.windows):
+            if len(self.history) >= window:
+                leaving = self.history[-window]
+                leaving_present = ~np.isnan(leaving)
+                self.sums[row] -= np.where(leaving_present, leaving, 0)
+                self.counts[row] -= leaving_present
+            self.sums[row] += filled
+            self.counts[row] += present
+
+        alphas = np.asarray(self.alphas)[:, None]
+        updated = np.where(np.isnan(self.ewm), values, alphas * values + (1 - alphas) * self.ewm)
+        self.ewm = np.where(present, updated, self.ewm)
+
+        self.history.append(values)
+        self.games += 1
+        return self
+
+    def update(self, data: pd.DataFrame) -> RollingForm:
+        """Appends cleaned games played after the last seen one, in order of
+        start_time (and match_id for games of the same day).
+        """
+        data = data.sort_values(["start_time", "match_id"], kind="mergesort")
+        values = data[self.metrics].copy()
+        if "win" in values.columns and values["win"].dtype == object:
+            values["win"] = (values["win"] == "Win").astype("float")
+        values = values.to_numpy(dtype="float")
+        start_times = data["start_time"].to_numpy()
+        match_ids = data["match_id"].to_numpy()
+
+        # filter and appends happen under one lock, so sessions updating the
+        # same form concurrently never append a game twice
+        with self._lock:
+            if self.last_seen is not None:
+                start_time, match_id = self.last_seen
+                newer = (start_times > start_time) | (
+                    (start_times == start_time) & (match_ids > match_id)
+                )
+                values, start_times, match_ids = (
+                    values[newer], start_times[newer], match_ids[newer]
+                )
+            if not len(values):
+                return self
+            for game in values:
+                self.append(game)
+            self.last_seen = [start_times[-1:].tolist()[0], int(match_ids[-1])]
+        return self
+
+    def current(self) -> pd.DataFrame:
+        """Returns current form: rows are windows and EWM variants."""
+        with self._lock, np.errstate(divide="ignore", invalid="ignore"):
+            means = self.sums / self.counts
+            ewm = self.ewm.copy()
+        index = [f"last_{w}" for w in self.windows] + [f"ewm_{a:g}" for a in self.alphas]
+        return pd.DataFrame(np.vstack([means, ewm]), index=index, columns=self.metrics)
+
+    def save(self, path: str) -> None:
+        state = {
+            "metrics": self.metrics,
+            "windows": self.windows,
+            "alphas": self.alphas,
+            "games": self.games,
+            "last_seen": self.last_seen,
+            "history": [values.tolist() for values in self.history],
+            "sums": self.sums.tolist(),
+            "counts": self.counts.tolist(),
+            "ewm": self.ewm.tolist(),
+        }
+        with open(path, "w") as file:
+            json.dump(state, file)
+
+    @classmethod
+    def load(cls, path: str) -> RollingForm:
+        with open(path) as file:
+            return cls(**json.load(file))
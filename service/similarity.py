@@ -0,0 +1,157 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List
+
+import config
+
+
+def duration_seconds(duration: pd.Series) -> pd.Series:
+    """Converts cleaned "minutes:seconds" durations back to seconds."""
+    if duration.dtype != object:
+        return duration.astype("float")
+    parts = duration.str.split(":", expand=True).astype("float")
+    return parts[0] * 60 + parts[1]
+
+
+@dataclass
+class SimilarGames:
+    """Nearest-neighbor index of cleaned games. Numeric features are
+    standardized with running statistics (missing values count as the mean),
+    categorical ones are one-hot encoded. Only raw per-game terms are
+    stored, so appending games adds rows and nothing is rebuilt, while
+    queries always use current statistics.
+    """
+
+    numeric: List[str] = field(
+        default_factory=lambda: list(config.similarity_numeric)
+    )
+    categorical: List[str] = field(
+        default_factory=lambda: list(config.similarity_categorical)
+    )
+    categorical_weight: float = 1.0
+    size: int = 0
+    _terms: np.ndarray = field(default=None, repr=False)
+    _codes: np.ndarray = field(default=None, repr=False)
+    _match_ids: np.ndarray = field(default=None, repr=False)
+    _positions: Dict[int, int] = field(default_factory=dict, repr=False)
+    _vocabularies: List[Dict] = field(default=None, repr=False)
+    _count: np.ndarray = field(default=None, repr=False)
+    _sum: np.ndarray = field(default=None, repr=False)
+    _sumsq: np.ndarray = field(default=None, repr=False)
+
+    def __post_init__(self):
+        width = len(self.numeric)
+        # value (0 if missing), its square and 1 if present for every feature
+        self._terms = np.empty((0, 3 * width))
+        self._codes = np.empty((0, len(self.categorical)), dtype="int")
+        self._match_ids = np.empty(0, dtype="int64")
+        self._vocabularies = [{} for _ in self.categorical]
+        self._count = np.zeros(width)
+        self._sum = np.zeros(width)
+        self._sumsq = np.zeros(width)
+
+    def _grow(self, array: np.ndarray, needed: int) -> np.ndarray:
+        """Grows storage geometrically so appends are amortized O(1)."""
+        if needed <= len(array):
+            return array
+        grown = np.empty((max(needed, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+        grown[:self.size] = array[:self.size]
+        return grown
+
+    def append(self, data: pd.DataFrame) -> SimilarGames:
+        """Adds cleaned games that aren't in the index yet."""
+        data = data[~np.isin(data["match_id"].to_numpy(), self._match_ids[:self.size])]
+        data = data.drop_duplicates(subset=["match_id"])
+        if data.empty:
+            return self
+
+        numeric = data[self.numeric].copy()
+        if "duration" in numeric.columns:
+            numeric["duration"] = duration_seconds(numeric["duration"])
+        values = numeric.to_numpy(dtype="float")
+
+        codes = np.empty((len(data), len(self.categorical)), dtype="int")
+        for column, (name, vocabulary) in enumerate(zip(self.categorical, self._vocabularies)):
+            for value in data[name].fillna("unknown").unique():
+                vocabulary.setdefault(value, len(vocabulary))
+            codes[:, column] = data[name].fillna("unknown").map(vocabulary).to_numpy()
+
+        start, end = self.size, self.size + len(data)
+        self._terms = self._grow(self._terms, end)
+        self._codes = self._grow(self._codes, end)
+        self._match_ids = self._grow(self._match_ids, end)
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0)
+        self._terms[start:end] = np.hstack([filled, filled ** 2, present])
+        self._codes[start:end] = codes
+        self._match_ids[start:end] = data["match_id"].to_numpy()
+        self._positions.update(zip(data["match_id"], range(start, end)))
+        self.size = end
+
+        self._count += present.sum(axis=0)
+        self._sum += filled.sum(axis=0)
+        self._sumsq += (filled ** 2).sum(axis=0)
+        return self
+
+    def _statistics(self) -> tuple:
+        """Current mean and standard deviation of numeric features."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self._sum / self._count
+            std = np.sqrt(self._sumsq / self._count - mean ** 2)
+        return np.nan_to_num(mean), np.where(std > 0, std, 1)
+
+    def feature_matrix(self) -> pd.DataFrame:
+        """Returns standardized numeric and one-hot categorical features."""
+        mean, std = self._statistics()
+        width = len(self.numeric)
+        values = self._terms[:self.size, :width]
+        present = self._terms[:self.size, 2 * width:].astype("bool")
+        scaled = np.where(present, (values - mean) / std, 0)
+        features = [pd.DataFrame(scaled, columns=self.numeric)]
+        for column, (name, vocabulary) in enumerate(zip(self.categorical, self._vocabularies)):
+            one_hot = np.zeros((self.size, len(vocabulary)))
+            one_hot[np.arange(self.size), self._codes[:self.size, column]] = 1
+            features.append(pd.DataFrame(
+                one_hot, columns=[f"{name}_{value}" for value in vocabulary]
+            ))
+        matrix = pd.concat(features, axis=1)
+        matrix.index = self._match_ids[:self.size]
+        return matrix
+
+    def similar(self, match_id: int, k: int = 10) -> pd.DataFrame:
+        """Returns k games most similar to the given one with distances.
+        Squared distance of one-hot vectors is 2 per differing category, so
+        categorical features are compared by codes without expanding them.
+        """
+        position = self._positions[match_id]
+        codes = self._codes[:self.size]
+        terms = self._terms[:self.size]
+        mean, std = self._statistics()
+        weights = 1 / std ** 2
+        width = len(self.numeric)
+
+        # |a - b|^2 = |a|^2 - 2ab + |b|^2 of standardized features, expanded
+        # over the stored terms of a, so the scan is one mat-vec product
+        row = terms[position]
+        centered = row[2 * width:] * (row[:width] - mean)
+        vector = np.concatenate([
+            -2 * weights * (mean + centered),
+            weights,
+            weights * mean * (mean + 2 * centered),
+        ])
+        distances = terms @ vector + (weights * centered ** 2).sum()
+        distances += 2 * self.categorical_weight * (codes != codes[position]).sum(axis=1)
+        distances[position] = np.inf
+
+        k = min(k, self.size - 1)
+        if k <= 0:
+            return pd.DataFrame(columns=["match_id", "distance"])
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return pd.DataFrame({
+            "match_id": self._match_ids[nearest],
+            "distance": np.sqrt(np.maximum(distances[nearest], 0)),
+        })
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.cleaner import DataCleaner
+
+TIMED = [("clean_dn_t", "dn_t", "dn"), ("clean_lh_t", "lh_t", "lh"),
+         ("clean_gold_t", "gold_t", "nw"), ("clean_xp_t", "xp_t", "xp")]
+
+
+class TestTimedStats(unittest.TestCase):
+
+    def test_games_shorter_than_30_minutes(self):
+        for method, column, prefix in TIMED:
+            data = pd.DataFrame({column: [list(range(25)), list(range(40)), None]}, index=[7, 8, 9])
+            cleaned = getattr(DataCleaner(), method)(data)
+            np.testing.assert_array_equal(cleaned[f"{prefix}_10"], [9, 9, np.nan])
+            np.testing.assert_array_equal(cleaned[f"{prefix}_30"], [np.nan, 29, np.nan])
+            self.assertNotIn(column, cleaned.columns)
+
+    def test_empty_frame(self):
+        for method, column, prefix in TIMED:
+            cleaned = getattr(DataCleaner(), method)(pd.DataFrame({column: []}))
+            self.assertEqual(list(cleaned.columns), [f"{prefix}_10", f"{prefix}_20", f"{prefix}_30"])
+            self.assertEqual(len(cleaned), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.comparison import compare_to_lobby
+
+
+def make_lobby():
+    rows = [
+        # match 1: player on Radiant in lane 1 against two Dire laners
+        (1, 7, 0, 1, 1, 5),
+        (1, None, 1, 2, 1, 1),
+        (1, 20, 128, 3, 1, 3),
+        (1, 21, 129, 1, 1, 9),
+        (1, 22, 2, 4, 2, 0),
+        (1, None, 130, 5, 3, 2),
+        # match 2: player on Dire in lane 3 with no Radiant opponent there
+        (2, None, 0, 1, 1, 8),
+        (2, 7, 130, 1, 3, 4),
+        (2, 30, 131, 6, 3, 2),
+    ]
+    return pd.DataFrame(
+        rows, columns=['match_id', 'account_id', 'player_slot', 'hero_id', 'lane', 'kills']
+    )
+
+
+class TestCompareToLobby(unittest.TestCase):
+
+    def setUp(self):
+        self.comparison = compare_to_lobby(make_lobby(), '7', ['kills'])
+
+    def test_one_row_per_match_of_the_player(self):
+        self.assertEqual(list(self.comparison.index), [1, 2])
+        self.assertEqual(list(self.comparison.lane), [1, 3])
+
+    def test_match_and_lane_percentiles(self):
+        np.testing.assert_allclose(self.comparison.kills_match_pct, [5 / 6, 2 / 3])
+        np.testing.assert_allclose(self.comparison.kills_lane_pct, [3 / 4, 1])
+
+    def test_difference_with_lane_opponents(self):
+        self.assertEqual(self.comparison.loc[1, 'kills_vs_lane'], 5 - 6)
+        self.assertTrue(np.isnan(self.comparison.loc[2, 'kills_vs_lane']))
+
+    def test_hero_percentile_over_all_matches(self):
+        np.testing.assert_allclose(self.comparison.kills_hero_pct, [2 / 4, 1 / 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
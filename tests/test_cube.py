@@ -0,0 +1,80 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from service.cube import AggregateCube
+
+
+def make_data(heroes, wins, lh_10, match_ids):
+    return pd.DataFrame({
+        "match_id": match_ids,
+        "hero": heroes,
+        "patch": "7.27",
+        "side": "Radiant",
+        "league": "TI",
+        "lane": "mid",
+        "win": wins,
+        "lh_10": lh_10,
+    })
+
+
+class TestCube(unittest.TestCase):
+
+    def setUp(self):
+        self.first = make_data(["Puck", "Puck", "Lina"], ["Win", "Lose", "Win"], [40, 50, 60], [1, 2, 3])
+        self.second = make_data(["Puck", "Tinker"], ["Win", "Lose"], [60, None], [4, 5])
+
+    def test_winrate_by_hero(self):
+        cube = AggregateCube().update(self.first)
+        winrate = cube.winrate(by=["hero"])
+        self.assertEqual(winrate.loc["Puck", "games"], 2)
+        self.assertAlmostEqual(winrate.loc["Puck", "winrate"], 0.5)
+
+    def test_incremental_update_matches_full_rebuild(self):
+        incremental = AggregateCube().update(self.first).update(self.second)
+        full = AggregateCube().update(pd.concat([self.first, self.second]))
+        pd.testing.assert_frame_equal(
+            incremental.query("lh_10", by=["hero"]),
+            full.query("lh_10", by=["hero"]),
+        )
+
+    def test_refreshed_frame_is_not_double_counted(self):
+        cube = AggregateCube().update(self.first)
+        cube.update(pd.concat([self.first, self.second]))
+        self.assertEqual(cube.winrate().loc["all", "games"], 5)
+        self.assertEqual(cube.winrate(by=["hero"]).loc["Puck", "games"], 3)
+
+    def test_query_with_filters_skips_missing_values(self):
+        cube = AggregateCube().update(self.first).update(self.second)
+        answer = cube.query("lh_10", hero=["Puck", "Tinker"])
+        self.assertEqual(answer["count"].iloc[0], 3)
+        self.assertAlmostEqual(answer["mean"].iloc[0], 50)
+        self.assertAlmostEqual(answer["std"].iloc[0], 10)
+
+    def test_empty_cube(self):
+        for cube in [AggregateCube(), AggregateCube().update(self.first.iloc[:0])]:
+            winrate = cube.winrate(by=["hero"])
+            self.assertEqual(len(winrate), 0)
+            self.assertEqual(list(winrate.reset_index().columns), ["hero", "games", "winrate"])
+            self.assertEqual(len(cube.query("lh_10")), 0)
+
+    def test_concurrent_updates_count_games_once(self):
+        cube = AggregateCube()
+        data = make_data(["Puck"] * 2000, ["Win"] * 2000, [50] * 2000, range(2000))
+        barrier = threading.Barrier(8)
+
+        def update():
+            barrier.wait()
+            cube.update(data)
+
+        threads = [threading.Thread(target=update) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cube.winrate().loc["all", "games"], 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.curves import advantage_matrix, curve_stats
+
+
+def make_data():
+    return pd.DataFrame({
+        "radiant_gold_adv": [[0, 100, 200], [0, -50], [0, 300, 600, 900], None],
+        "side": ["Radiant", "Dire", "Radiant", "Dire"],
+        "hero": ["Puck", "Puck", "Lina", "Lina"],
+    })
+
+
+class TestCurves(unittest.TestCase):
+
+    def test_dire_rows_are_flipped_and_padded(self):
+        matrix = advantage_matrix(make_data(), "radiant_gold_adv", min_width=5)
+        self.assertEqual(matrix.shape, (4, 5))
+        np.testing.assert_array_equal(matrix[0], [0, 100, 200, np.nan, np.nan])
+        np.testing.assert_array_equal(matrix[1], [0, 50, np.nan, np.nan, np.nan])
+        self.assertTrue(np.isnan(matrix[3]).all())
+
+    def test_grouped_mean_and_median(self):
+        curves = curve_stats(make_data(), "radiant_gold_adv", by=["hero"]).set_index(["hero", "minute"])
+        self.assertEqual(curves.loc[("Puck", 1), "games"], 2)
+        self.assertAlmostEqual(curves.loc[("Puck", 1), "mean"], 75)
+        self.assertAlmostEqual(curves.loc[("Puck", 1), "median"], 75)
+        self.assertEqual(curves.loc[("Puck", 2), "games"], 1)
+        self.assertAlmostEqual(curves.loc[("Puck", 2), "median"], 200)
+        # Lina's Dire game has no curve, so only the Radiant one counts
+        self.assertEqual(list(curves.loc["Lina", "games"]), [1, 1, 1, 1])
+        self.assertNotIn(("Puck", 3), curves.index)
+
+    def test_matches_per_group_percentiles(self):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({
+            "radiant_gold_adv": [list(rng.normal(0, 1000, rng.integers(1, 40))) for _ in range(300)],
+            "side": rng.choice(["Radiant", "Dire"], 300),
+            "hero": rng.choice(["Puck", "Lina", "Tinker", None], 300),
+        })
+        curves = curve_stats(data, "radiant_gold_adv", by=["hero", "side"], percentiles=(10, 90))
+        matrix = advantage_matrix(data, "radiant_gold_adv")
+        for (hero, side), curve in curves.groupby(["hero", "side"]):
+            rows = matrix[((data["hero"] == hero) & (data["side"] == side)).to_numpy()]
+            minutes = curve["minute"].to_numpy()
+            np.testing.assert_allclose(curve["mean"], np.nanmean(rows, axis=0)[minutes])
+            for q, name in [(50, "median"), (10, "p10"), (90, "p90")]:
+                np.testing.assert_allclose(curve[name], np.nanpercentile(rows, q, axis=0)[minutes])
+        self.assertEqual(curves["games"].sum(), data.dropna(subset=["hero"])["radiant_gold_adv"].map(len).sum())
+
+    def test_empty_data(self):
+        curves = curve_stats(make_data().iloc[:0], "radiant_gold_adv", by=["side"])
+        self.assertEqual(len(curves), 0)
+        self.assertIn("median", curves.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
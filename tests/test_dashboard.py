@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.dashboard import downsample, lttb
+
+
+class TestDownsampling(unittest.TestCase):
+
+    def test_lttb_keeps_ends_and_peaks(self):
+        x = np.arange(10000)
+        y = np.sin(x / 500)
+        y[4321] = 50
+        rows = lttb(x, y, 100)
+        self.assertEqual(len(rows), 100)
+        self.assertEqual(rows[0], 0)
+        self.assertEqual(rows[-1], 9999)
+        self.assertIn(4321, rows)
+        self.assertTrue((np.diff(rows) > 0).all())
+
+    def test_short_series_is_untouched(self):
+        self.assertEqual(list(lttb(np.arange(5), np.arange(5), 10)), [0, 1, 2, 3, 4])
+
+    def test_downsample_shares_budget_between_groups(self):
+        data = pd.DataFrame({
+            'start_time': pd.date_range('2020-01-01', periods=4000, freq='H'),
+            'gold_per_min': np.random.default_rng(0).normal(500, 50, 4000),
+            'win': ['Win', 'Lose'] * 2000,
+        })
+        sampled = downsample(data, 'start_time', 'gold_per_min', by='win', budget=200)
+        self.assertEqual(len(sampled), 200)
+        self.assertEqual(sampled.win.value_counts().to_dict(), {'Win': 100, 'Lose': 100})
+
+    def test_more_groups_than_budget_allows(self):
+        # hero_0 is played 120 times, hero_119 once
+        heroes = np.repeat([f'hero_{i}' for i in range(120)], np.arange(120, 0, -1))
+        data = pd.DataFrame({
+            'start_time': pd.date_range('2020-01-01', periods=len(heroes), freq='H'),
+            'gold_per_min': np.random.default_rng(0).normal(500, 50, len(heroes)),
+            'hero': heroes,
+        })
+        sampled = downsample(data, 'start_time', 'gold_per_min', by='hero', budget=30)
+        self.assertLessEqual(len(sampled), 30)
+        self.assertEqual(set(sampled.hero), {f'hero_{i}' for i in range(10)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import export
+
+
+def make_data(patches):
+    return pd.DataFrame({
+        "match_id": range(len(patches)),
+        "patch": patches,
+        "player": "mind_control",
+        "kills": 1,
+    })
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_read_players(self):
+        path = self.out / "players.txt"
+        path.write_text("mind_control\n\n# retired\nPuppey\n  mind_control  \nMiracle-\n")
+        self.assertEqual(export.read_players(path), ["mind_control", "Puppey", "Miracle-"])
+
+    def test_resume_skips_done_players(self):
+        path = self.out / "players.txt"
+        path.write_text("mind_control\nPuppey\n")
+        (self.out / "_done").mkdir()
+        (self.out / "_done" / "Puppey").touch()
+
+        with mock.patch.object(export, "export_player", return_value=0) as export_player, \
+                mock.patch.object(export, "get_patches_data", return_value=[]), \
+                mock.patch.object(export, "get_heroes_data"), \
+                mock.patch.object(export, "get_pro_players"):
+            code = export.main([str(path), "--min-patch", "7.27", "--out", str(self.out), "--resume"])
+        self.assertEqual(code, 0)
+        self.assertEqual([call.args[0] for call in export_player.call_args_list], ["mind_control"])
+
+    def test_partitions_are_replaced(self):
+        export.write_player(make_data(["7.27", "7.27", "7.28"]), self.out, "mind_control")
+        export.write_player(make_data(["7.28"]), self.out, "mind_control")
+
+        partitions = sorted(path.relative_to(self.out).as_posix()
+                            for path in self.out.glob("patch=*/player=*"))
+        self.assertEqual(partitions, ["patch=7.28/player=mind_control"])
+        self.assertFalse((self.out / "_staging" / "mind_control").exists())
+        self.assertTrue((self.out / "_done" / "mind_control").exists())
+        self.assertEqual(len(pd.read_parquet(self.out / "patch=7.28" / "player=mind_control")), 1)
+
+    def test_failed_write_keeps_old_partitions(self):
+        export.write_player(make_data(["7.27"]), self.out, "mind_control")
+        (self.out / "_done" / "mind_control").unlink()
+
+        with mock.patch.object(pd.DataFrame, "to_parquet", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                export.write_player(make_data(["7.28"]), self.out, "mind_control")
+        self.assertTrue((self.out / "patch=7.27" / "player=mind_control").exists())
+        self.assertFalse((self.out / "_done" / "mind_control").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
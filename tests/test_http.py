@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from utils import http
+from utils.match_cache import MatchCache
+
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    return response
+
+
+class TestGet(unittest.TestCase):
+
+    def setUp(self):
+        for patcher in [
+            mock.patch.object(http.limiter, "interval", 0),
+            mock.patch.object(http.config, "http_retries", 3),
+            mock.patch.object(http.config, "http_backoff", 2.0),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        sleep = mock.patch.object(http.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def get(self, *outcomes):
+        with mock.patch.object(http.session, "get", side_effect=outcomes) as get:
+            try:
+                return http.get("https://api.opendota.com/api/matches/1")
+            finally:
+                self.calls = get.call_count
+
+    def test_retries_with_backoff(self):
+        response = self.get(make_response(503), make_response(502), requests.ConnectionError(),
+                            make_response(200))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 4)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [2.0, 4.0, 8.0])
+
+    def test_honors_retry_after(self):
+        self.get(make_response(429, {"Retry-After": "7"}), make_response(200))
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_raises_after_last_attempt(self):
+        with self.assertRaises(requests.HTTPError):
+            self.get(*[make_response(500)] * 4)
+        self.assertEqual(self.calls, 4)
+        with self.assertRaises(requests.ConnectionError):
+            self.get(*[requests.ConnectionError()] * 4)
+
+    def test_client_errors_are_not_retried(self):
+        with self.assertRaises(requests.HTTPError):
+            self.get(make_response(404), make_response(200))
+        self.assertEqual(self.calls, 1)
+        self.sleep.assert_not_called()
+
+
+class TestMatchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = MatchCache(str(Path(self.tmp.name) / "matches"))
+
+    def test_put_get_and_delete(self):
+        self.assertIsNone(self.cache.get(1))
+        self.cache.put(1, b'{"match_id": 1}')
+        self.assertEqual(self.cache.get(1), b'{"match_id": 1}')
+        self.assertEqual([path.name for path in Path(self.cache.directory).iterdir()], ["1.json"])
+        self.cache.delete(1)
+        self.assertIsNone(self.cache.get(1))
+        self.cache.delete(1)
+
+    def test_existing_file_is_kept(self):
+        self.cache.put(1, b"first")
+        self.cache.put(1, b"second")
+        self.assertEqual(self.cache.get(1), b"first")
+
+    def test_failed_write_leaves_no_file(self):
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.cache.put(1, b"{}")
+        self.assertEqual(list(Path(self.cache.directory).iterdir()), [])
+
+    def test_disabled_cache(self):
+        cache = MatchCache()
+        cache.put(1, b"{}")
+        self.assertIsNone(cache.get(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
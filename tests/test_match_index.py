@@ -0,0 +1,58 @@
+import unittest
+from types import SimpleNamespace
+
+import pandas as pd
+
+from service.match_index import MatchIndex, to_timestamp
+
+PATCHES = [
+    {"name": "7.26", "date": "2020-01-01"},
+    {"name": "7.27", "date": "2020-06-01"},
+    {"name": "7.28", "date": "2020-12-01"},
+]
+
+
+def make_player(min_patch="7.26"):
+    data = pd.DataFrame({
+        "match_id": [5, 3, 9, 7],
+        "start_time": [to_timestamp(date) for date in
+                       ["2020-07-01", "2020-03-01", "2021-01-02", "2020-12-05"]],
+    })
+    return SimpleNamespace(player_id="1", player_data=data, lobby_stats=None, min_patch=min_patch)
+
+
+class TestMatchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = MatchIndex(PATCHES).add(make_player())
+
+    def test_between_patches(self):
+        self.assertEqual(list(self.index.between_patches("7.27").match_id), [5, 7, 9])
+        self.assertEqual(list(self.index.between_patches("7.26", "7.27").match_id), [3, 5])
+        self.assertEqual(list(self.index.between_patches("7.28", "7.28").match_id), [7, 9])
+
+    def test_between_dates_and_match_ids(self):
+        self.assertEqual(list(self.index.between_dates("2020-06-15", "2020-12-31").match_id), [5, 7])
+        self.assertEqual(list(self.index.between_match_ids(4, 8).match_id), [5, 7])
+        self.assertEqual(list(self.index.between_match_ids(10, 20).match_id), [])
+
+    def test_covers(self):
+        index = MatchIndex(PATCHES).add(make_player("7.27"))
+        self.assertTrue(index.covers("7.27"))
+        self.assertTrue(index.covers("7.28"))
+        self.assertFalse(index.covers("7.26"))
+        self.assertFalse(MatchIndex(PATCHES).covers("7.28"))
+
+    def test_expired_index_needs_refresh(self):
+        index = MatchIndex(PATCHES, ttl=0).add(make_player())
+        self.assertFalse(index.covers("7.28"))
+
+    def test_unknown_patch(self):
+        with self.assertRaises(ValueError):
+            self.index.between_patches("7.99")
+        with self.assertRaises(ValueError):
+            self.index.covers("latest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from utils.parsing import parse_match, project_match
+
+
+def make_match():
+    return {
+        "match_id": 1,
+        "duration": 2400,
+        "radiant_gold_adv": [0, 100],
+        "chat": [{"key": "gg"}] * 100,
+        "players": [
+            {"account_id": 86745912, "player_slot": 0, "kills": 3, "hero_id": 1, "purchase_log": []},
+            {"account_id": 111, "player_slot": 128, "kills": 7, "hero_id": 2, "purchase_log": []},
+            {"account_id": None, "player_slot": 129, "kills": 0, "hero_id": 3},
+        ],
+    }
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_keeps_only_configured_match_keys(self):
+        match = project_match(make_match(), ["match_id", "duration", "patch"], [], "86745912")
+        self.assertEqual(match, {"match_id": 1, "duration": 2400, "patch": None})
+
+    def test_keeps_only_target_player(self):
+        match = project_match(make_match(), ["match_id", "players"], ["player_slot", "kills"], "86745912")
+        self.assertEqual(match["players"], [{"player_slot": 0, "kills": 3}])
+        # ids are compared as strings, anonymous players never match
+        match = project_match(make_match(), ["players"], ["kills"], "111")
+        self.assertEqual(match["players"], [{"kills": 7}])
+        self.assertEqual(project_match(make_match(), ["players"], ["kills"], "None")["players"], [])
+
+    def test_lobby_projection(self):
+        match = project_match(make_match(), ["match_id"], [], "111", lobby_fields=["player_slot", "hero_id"])
+        self.assertEqual(match["lobby"], [
+            {"player_slot": 0, "hero_id": 1},
+            {"player_slot": 128, "hero_id": 2},
+            {"player_slot": 129, "hero_id": 3},
+        ])
+        self.assertNotIn("lobby", project_match(make_match(), ["match_id"], [], "111"))
+
+    def test_missing_players(self):
+        raw = make_match()
+        del raw["players"]
+        match = project_match(raw, ["match_id", "players"], ["kills"], "111", lobby_fields=["hero_id"])
+        self.assertEqual(match, {"match_id": 1, "players": None, "lobby": None})
+
+    def test_parse_match(self):
+        raw = json.dumps(make_match()).encode()
+        match = parse_match(raw, ["match_id", "players"], ["kills"], "86745912")
+        self.assertEqual(match, {"match_id": 1, "players": [{"kills": 3}]})
+
+    def test_error_bodies(self):
+        for raw in [b'{"error": "Not Found"}', b"<html><body>502 Bad Gateway</body></html>",
+                    b"[1, 2]", b""]:
+            with self.assertRaises(ValueError):
+                parse_match(raw, ["match_id"], [], "111")
+
+
+if __name__ == "__main__":
+    unittest.main()
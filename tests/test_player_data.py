@@ -0,0 +1,169 @@
+import json
+import tempfile
+import unittest
+from urllib.parse import unquote
+from unittest import mock
+
+from service import player_data
+from service.player_data import PlayerData
+from utils.match_cache import MatchCache
+from utils.validation import INT, LIST, MATCH_SCHEMA, NAMED, NUMBER, PLAYER_SCHEMA
+
+VALUES = {INT: 1, NUMBER: 2.5, LIST: [0, 1], NAMED: {"name": "Team"}}
+
+
+def make_match(match_id, account_id=1, **changes):
+    """Full OpenDota-like match with the requested player in it."""
+    player = {
+        name: VALUES.get(rule, {} if name == "kill_streaks" else True)
+        for name, rule in PLAYER_SCHEMA.items()
+    }
+    player.update(match_id=match_id, account_id=account_id)
+    match = {name: VALUES.get(rule, "x") for name, rule in MATCH_SCHEMA.items()}
+    match.update(match_id=match_id, players=[player])
+    match.update(changes)
+    return match
+
+
+def make_player(**fields):
+    return PlayerData("mind_control", min_patch="7.27", patches_data=[], player_id="1", **fields)
+
+
+def responses(matches):
+    """Fake http.get answering /matches/<id> with the current matches."""
+
+    def get(url):
+        response = mock.Mock()
+        response.content = json.dumps(matches[int(url.rsplit("/", 1)[1])]).encode()
+        return response
+
+    return get
+
+
+class Explorer:
+    """Fake explorer endpoint serving given pages of match ids and answering
+    /matches/<id> with full matches. Keeps SQL of every explorer request.
+    """
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.queries = []
+        self.requests = []
+
+    def __call__(self, url):
+        self.requests.append(url.rsplit("/", 1)[1].split("?")[0])
+        response = mock.Mock()
+        if "explorer?sql=" in url:
+            self.queries.append(unquote(url.split("sql=", 1)[1]))
+            response.json.return_value = {"rows": [{"match_id": i} for i in self.pages.pop(0)]}
+        else:
+            match_id = int(url.rsplit("/", 1)[1])
+            response.content = json.dumps(make_match(match_id)).encode()
+        return response
+
+
+class TestMatchIds(unittest.TestCase):
+
+    def match_ids(self, explorer, **fields):
+        with mock.patch.object(player_data.http, "get", side_effect=explorer):
+            return list(make_player(**fields).iter_match_ids(page_size=3))
+
+    def test_stops_on_short_page(self):
+        explorer = Explorer([1, 2, 3], [5, 8])
+        self.assertEqual(self.match_ids(explorer), [1, 2, 3, 5, 8])
+        self.assertEqual(len(explorer.queries), 2)
+        self.assertIn("matches.match_id > 0", explorer.queries[0])
+        self.assertIn("matches.match_id > 3", explorer.queries[1])
+        self.assertIn("LIMIT 3", explorer.queries[1])
+
+    def test_stops_after_full_page_and_empty_one(self):
+        explorer = Explorer([1, 2, 3], [4, 6, 7], [])
+        self.assertEqual(self.match_ids(explorer), [1, 2, 3, 4, 6, 7])
+        self.assertEqual(len(explorer.queries), 3)
+        self.assertIn("matches.match_id > 7", explorer.queries[2])
+
+    def test_patch_bounds(self):
+        explorer = Explorer([])
+        self.match_ids(explorer)
+        self.assertIn("match_patch.patch >= cast(7.27 as varchar)", explorer.queries[0])
+        self.assertNotIn("match_patch.patch <=", explorer.queries[0])
+
+        explorer = Explorer([])
+        self.match_ids(explorer, max_patch="7.28")
+        self.assertIn("match_patch.patch <= cast(7.28 as varchar)", explorer.queries[0])
+
+    def test_match_ids_are_filled_while_streaming(self):
+        explorer = Explorer([1, 2, 3], [4])
+        with mock.patch.object(player_data, "match_cache", MatchCache()), \
+                mock.patch.object(player_data.http, "get", side_effect=explorer), \
+                mock.patch.object(player_data.config, "explorer_page_size", 3):
+            player = make_player().get_matches_data()
+        self.assertEqual(player.match_ids, [1, 2, 3, 4])
+        self.assertEqual(list(player.matches_data["match_id"]), [1, 2, 3, 4])
+        # the second page is requested only after matches of the first one
+        self.assertEqual(explorer.requests, ["explorer", "1", "2", "3", "explorer", "4"])
+
+
+class TestIngest(unittest.TestCase):
+
+    def test_bad_matches_are_quarantined(self):
+        bodies = {
+            1: json.dumps(make_match(1)).encode(),
+            2: json.dumps(make_match(2, radiant_team=None)).encode(),
+            3: json.dumps(make_match(3, account_id=2)).encode(),
+            4: b'{"error": "Internal Server Error"}',
+        }
+        with mock.patch.object(player_data, "match_cache", MatchCache()), \
+                mock.patch.object(player_data, "fetch_match", side_effect=lambda i: (bodies[i], False)):
+            player = make_player(match_ids=[1, 2, 3, 4]).get_matches_data()
+
+        self.assertEqual(player.rejected, [
+            {"match_id": 2, "reason": "missing radiant_team"},
+            {"match_id": 3, "reason": "player not in match"},
+        ])
+        self.assertEqual([match["match_id"] for match in player.failed], [4])
+        self.assertIn("ValueError", player.failed[0]["error"])
+        self.assertEqual(player.rejection_report().to_dict(),
+                         {"missing radiant_team": 1, "player not in match": 1})
+        self.assertEqual(list(player.matches_data["match_id"]), [1])
+        self.assertEqual(list(player.matches_data.columns), player.match_fields)
+
+
+class TestMatchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = MatchCache(self.tmp.name)
+        patcher = mock.patch.object(player_data, "match_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_narrow_fetch_doesnt_cache_unparsed_matches(self):
+        matches = {1: make_match(1, radiant_gold_adv=None), 2: make_match(2)}
+        with mock.patch.object(player_data.http, "get", side_effect=responses(matches)) as get:
+            narrow = make_player(
+                match_ids=[1, 2], match_fields=["match_id", "players"], player_fields=["match_id", "kills"]
+            ).get_matches_data()
+            self.assertEqual(len(narrow.matches_data), 2)
+            self.assertIsNone(self.cache.get(1))
+            self.assertIsNotNone(self.cache.get(2))
+
+            # once OpenDota parses the match the full fetch downloads it again
+            matches[1] = make_match(1)
+            full = make_player(match_ids=[1, 2]).get_matches_data()
+        self.assertEqual(len(full.matches_data), 2)
+        self.assertEqual(full.rejected, [])
+        self.assertEqual(get.call_count, 3)
+
+    def test_stale_cached_copy_is_downloaded_again(self):
+        self.cache.put(1, json.dumps(make_match(1, radiant_xp_adv=None)).encode())
+        with mock.patch.object(player_data.http, "get", side_effect=responses({1: make_match(1)})) as get:
+            player = make_player(match_ids=[1]).get_matches_data()
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(len(player.matches_data), 1)
+        self.assertEqual(json.loads(self.cache.get(1))["radiant_xp_adv"], [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.profiling import make_profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_accumulated_stages_inside_a_stage(self):
+        profiler = make_profiler(str(self.out))
+        with profiler.stage("get_matches_data"):
+            for _ in range(3):
+                with profiler.accumulate("fetch_match"):
+                    sum(range(1000))
+                with profiler.accumulate("parse_match"):
+                    sorted(range(1000))
+            profiler.flush()
+        files = sorted(path.name for path in self.out.glob("*.pstats"))
+        self.assertEqual(files, ["000_get_matches_data.pstats", "001_fetch_match.pstats",
+                                 "002_parse_match.pstats"])
+
+    def test_runs_share_numbering(self):
+        with make_profiler(str(self.out)).stage("clean_hero"):
+            pass
+        with make_profiler(str(self.out)).stage("clean_hero"):
+            pass
+        self.assertEqual(len(list(self.out.glob("*_clean_hero.pstats"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import pandas as pd
+
+from service.query import Query, run_steps
+
+
+class TestQueryPlan(unittest.TestCase):
+
+    def test_narrow_query_prunes_fields_and_steps(self):
+        plan = Query('mind_control').select('kda', 'win').plan()
+        steps = [step.name for step in plan.steps]
+        self.assertEqual(plan.match_fields, ['match_id', 'players'])
+        self.assertEqual(plan.player_fields, ['match_id', 'win', 'kills', 'assists', 'deaths'])
+        self.assertNotIn('clean_gold_adv', steps)
+        self.assertNotIn('clean_hero', steps)
+
+    def test_gold_diff_pulls_in_side(self):
+        plan = Query('mind_control').select('gold_diff_10').plan()
+        steps = [step.name for step in plan.steps]
+        self.assertLess(steps.index('clean_player_slot'), steps.index('clean_gold_adv'))
+        self.assertIn('radiant_gold_adv', plan.match_fields)
+        self.assertIn('player_slot', plan.player_fields)
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            Query('mind_control').select('mmr').plan()
+
+    def test_raw_column_with_derived_one(self):
+        for columns in [('player_slot', 'side'), ('hero_id', 'hero'), ('dn_t', 'dn_10'),
+                        ('radiant_gold_adv', 'gold_diff_10')]:
+            with self.assertRaises(ValueError):
+                Query('mind_control').select(*columns).plan()
+        # kda keeps its inputs, so they can be selected together
+        Query('mind_control').select('kills', 'kda').plan()
+
+    def test_run_planned_steps(self):
+        plan = Query('mind_control').select('kda', 'win').plan()
+        data = pd.DataFrame({
+            'match_id': [1, 2],
+            'win': [1, 0],
+            'kills': [3, 4],
+            'assists': [5, 0],
+            'deaths': [2, 0],
+        })
+        cleaned = run_steps(data, plan.steps, [])
+        self.assertEqual(list(cleaned.win), ['Win', 'Lose'])
+        self.assertEqual(list(cleaned.kda), [4.0, 4.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.rolling import RollingForm
+
+
+def make_games(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'match_id': np.arange(n),
+        'start_time': pd.date_range('2020-01-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'win': rng.choice(['Win', 'Lose'], n),
+        'kda': rng.uniform(0, 10, n).round(2),
+        'gold_per_min': rng.integers(300, 800, n).astype('float'),
+    })
+
+
+class TestRollingForm(unittest.TestCase):
+
+    def test_matches_full_recomputation(self):
+        games = make_games(50)
+        games.loc[47, 'kda'] = np.nan
+        form = RollingForm().update(games.sample(frac=1, random_state=1)).current()
+
+        values = games.assign(win=(games.win == 'Win').astype('float'))
+        for window in [5, 10, 20]:
+            expected = values[['win', 'kda', 'gold_per_min']].tail(window).mean()
+            np.testing.assert_allclose(form.loc[f'last_{window}'], expected)
+        expected = values[['win', 'kda', 'gold_per_min']].ewm(alpha=0.3, adjust=False, ignore_na=True).mean().iloc[-1]
+        np.testing.assert_allclose(form.loc['ewm_0.3'], expected)
+
+    def test_incremental_refresh_from_saved_state(self):
+        games = make_games(40)
+        full = RollingForm().update(games).current()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'form.json')
+            RollingForm().update(games.iloc[:25]).save(path)
+            # overlapping refresh: already seen games are skipped
+            form = RollingForm.load(path).update(games.iloc[20:])
+
+        self.assertEqual(form.games, 40)
+        pd.testing.assert_frame_equal(form.current(), full)
+
+    def test_concurrent_updates_append_games_once(self):
+        games = make_games(2000)
+        form = RollingForm()
+        barrier = threading.Barrier(8)
+
+        def update():
+            barrier.wait()
+            form.update(games)
+
+        threads = [threading.Thread(target=update) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(form.games, 2000)
+        pd.testing.assert_frame_equal(form.current(), RollingForm().update(games).current())
+
+
+if __name__ == "__main__":
+    unittest.main()
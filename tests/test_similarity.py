@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from service.cleaner import DataCleaner
+from service.similarity import SimilarGames, duration_seconds
+
+
+def make_games(rng, match_ids):
+    n = len(match_ids)
+    data = pd.DataFrame({
+        "match_id": match_ids,
+        "lh_10": rng.normal(50, 15, n),
+        "kda": rng.exponential(3, n),
+        "duration": DataCleaner().clean_duration(
+            pd.DataFrame({"duration": rng.integers(900, 5400, n)})
+        )["duration"],
+        "hero": rng.choice(["Puck", "Lina", "Tinker"], n),
+        "side": rng.choice(["Radiant", "Dire"], n),
+    })
+    data.loc[data.index[::7], "lh_10"] = np.nan
+    return data
+
+
+class TestSimilarGames(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.first = make_games(rng, range(1, 201))
+        self.second = make_games(rng, range(201, 301))
+
+    def make_index(self):
+        return SimilarGames(numeric=["lh_10", "kda", "duration"], categorical=["hero", "side"])
+
+    def test_duration_past_an_hour(self):
+        duration = DataCleaner().clean_duration(pd.DataFrame({"duration": [4503, 59, None]}))["duration"]
+        self.assertEqual(list(duration[:2]), ["75:03", "00:59"])
+        self.assertEqual(list(duration_seconds(duration[:2])), [4503, 59])
+
+    def test_similar_matches_brute_force(self):
+        index = self.make_index().append(self.first).append(self.second)
+        features = index.feature_matrix()
+        all_games = pd.concat([self.first, self.second])
+        numeric = all_games[["lh_10", "kda"]].assign(duration=duration_seconds(all_games["duration"]))
+        expected = ((numeric - numeric.mean()) / numeric.std(ddof=0)).fillna(0).to_numpy()
+        np.testing.assert_allclose(features[["lh_10", "kda", "duration"]].to_numpy(), expected)
+
+        for match_id in [1, 7, 150, 300]:
+            distances = np.sqrt(((features - features.loc[match_id]) ** 2).sum(axis=1)).drop(match_id)
+            nearest = index.similar(match_id, k=5)
+            np.testing.assert_allclose(nearest["distance"], distances.sort_values()[:5], rtol=1e-6)
+            np.testing.assert_allclose(distances[nearest["match_id"]], nearest["distance"], rtol=1e-6)
+
+    def test_incremental_append_matches_single_one(self):
+        incremental = self.make_index().append(self.first).append(self.second).append(self.first)
+        single = self.make_index().append(pd.concat([self.first, self.second]))
+        self.assertEqual(incremental.size, 300)
+        pd.testing.assert_frame_equal(incremental.feature_matrix(), single.feature_matrix())
+        pd.testing.assert_frame_equal(incremental.similar(42), single.similar(42))
+
+
+if __name__ == "__main__":
+    unittest.main()
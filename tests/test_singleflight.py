@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+
+from utils.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_fetch(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return object()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do(('mc', '7.27'), fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+        self.assertIs(flight.do(('mc', '7.27'), fetch), results[0])
+
+    def test_failed_call_is_not_cached(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError('api is down')
+
+        with self.assertRaises(RuntimeError):
+            flight.do('key', fail)
+        self.assertEqual(flight.do('key', lambda: 42), 42)
+
+    def test_results_expire(self):
+        flight = SingleFlight(ttl=0.05)
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        time.sleep(0.1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
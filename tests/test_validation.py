@@ -0,0 +1,51 @@
+import unittest
+
+from service.player_data import PlayerData
+from utils.validation import validate_match
+
+MATCH_FIELDS = ["match_id", "duration", "radiant_team", "players"]
+PLAYER_FIELDS = ["match_id", "kills", "kda"]
+
+
+def make_match(**changes):
+    match = {
+        "match_id": 1,
+        "duration": 2400,
+        "radiant_team": {"name": "Team Liquid"},
+        "players": [{"match_id": 1, "kills": 3, "kda": 2.5}],
+    }
+    match.update(changes)
+    return match
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_valid_match(self):
+        self.assertIsNone(validate_match(make_match(), MATCH_FIELDS, PLAYER_FIELDS))
+
+    def test_rejection_reasons(self):
+        cases = [
+            (make_match(players=None), "missing players"),
+            (make_match(players=[]), "player not in match"),
+            (make_match(duration="40:00"), "bad duration"),
+            (make_match(radiant_team={"tag": "TL"}), "missing radiant_team.name"),
+            (make_match(players=[{"match_id": 1, "kills": 3}]), "player missing kda"),
+            (make_match(players=[{"match_id": 1, "kills": 3.0, "kda": 2}]), "player bad kills"),
+        ]
+        for match, reason in cases:
+            self.assertEqual(validate_match(match, MATCH_FIELDS, PLAYER_FIELDS), reason)
+
+    def test_rejection_report(self):
+        player = PlayerData("mind_control", min_patch="7.27", patches_data=[])
+        player.rejected = [
+            {"match_id": 1, "reason": "missing players"},
+            {"match_id": 2, "reason": "player not in match"},
+            {"match_id": 3, "reason": "missing players"},
+        ]
+        self.assertEqual(player.rejection_report().to_dict(),
+                         {"missing players": 2, "player not in match": 1})
+        self.assertEqual(len(PlayerData("mind_control", min_patch="7.27", patches_data=[]).rejection_report()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
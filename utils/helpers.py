@@ -1,5 +1,25 @@
-import requests
-from config import BASE_URL
+from config import BASE_URL, constants_ttl
+from utils import http
+from utils.singleflight import SingleFlight
+
+
+# constants change only with game updates, so they are shared by the
+# whole process and refreshed every constants_ttl seconds
+constants = SingleFlight(ttl=constants_ttl)
+
+
+def fetch_constants(path: str, kind: type):
+    """Requests OpenDota constants of the expected type. Anything else, like
+    {"error": ...} body, raises ValueError, so it's never cached.
+    """
+
+    def fetch():
+        data = http.get(BASE_URL + path).json()
+        if not isinstance(data, kind) or not data:
+            raise ValueError(f"Unexpected response of {path}: {str(data)[:100]}")
+        return data
+
+    return constants.do(path, fetch)
 
 
 def id_to_name(id: float, requested_json: list) -> float:
@@ -18,10 +38,19 @@ def id_to_name(id: float, requested_json: list) -> float:
 
 def get_patches_data() -> list:
     """Gets current patch to use as default argument for initiating class
-    instance.
+    instance. Requested once per constants_ttl.
     """
-    patches_data = requests.get(BASE_URL + "constants/patch").json()
-    return patches_data
+    return fetch_constants("constants/patch", list)
+
+
+def get_heroes_data() -> dict:
+    """Gets heroes constants once per constants_ttl."""
+    return fetch_constants("constants/heroes", dict)
+
+
+def get_pro_players() -> list:
+    """Gets list of pro players once per constants_ttl."""
+    return fetch_constants("proPlayers", list)
 
 
 def get_current_patch(json: list) -> str:
@@ -40,6 +69,3 @@ def get_current_patch(json: list) -> str:
 #        new_cols_names[2] = values_per_time[timestamps[2]]
 #    )
 #    return data
-
-def negate(values):
-    return [value * -1 for value in values]
@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+
+@dataclass
+class RateLimiter:
+    """Spaces out requests made from any thread by a minimal interval."""
+
+    interval: float
+    _next_time: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+session = requests.Session()
+session.mount(
+    "https://", HTTPAdapter(pool_connections=1, pool_maxsize=config.http_pool_size)
+)
+limiter = RateLimiter(config.requests_interval)
+
+
+# statuses worth retrying, any other error status is raised right away
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def backoff(attempt: int, response: requests.Response = None) -> float:
+    """Seconds to wait before the next attempt, honoring Retry-After."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after is not None and retry_after.isdigit():
+        return float(retry_after)
+    return config.http_backoff * 2 ** attempt
+
+
+def get(url: str) -> requests.Response:
+    """Sends GET request through the shared session respecting rate limit.
+    Connection errors, 429 and 5xx are retried with exponential backoff,
+    error statuses left after that raise requests.HTTPError.
+    """
+    for attempt in range(config.http_retries + 1):
+        limiter.wait()
+        try:
+            response = session.get(url, timeout=config.http_timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == config.http_retries:
+                raise
+            time.sleep(backoff(attempt))
+            continue
+        if response.status_code in RETRY_STATUSES and attempt < config.http_retries:
+            time.sleep(backoff(attempt, response))
+            continue
+        response.raise_for_status()
+        return response
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import tempfile
+
+
+@dataclass
+class MatchCache:
+    """Raw match responses stored on disk by match id. Parsed matches don't
+    change, so the cache is shared by every thread, session and later run.
+    Disabled when directory is None.
+    """
+
+    directory: str = None
+
+    def _path(self, match_id: int) -> Path:
+        return Path(self.directory) / f"{match_id}.json"
+
+    def get(self, match_id: int) -> bytes:
+        """Returns cached response or None."""
+        if self.directory is None:
+            return None
+        try:
+            return self._path(match_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, match_id: int, raw: bytes) -> None:
+        """Stores response unless it's already there. Written to a temporary
+        file first, so readers never see a partial one.
+        """
+        if self.directory is None or self._path(match_id).exists():
+            return
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(raw)
+            os.replace(tmp, self._path(match_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def delete(self, match_id: int) -> None:
+        """Drops cached response if there is one."""
+        if self.directory is not None:
+            self._path(match_id).unlink(missing_ok=True)
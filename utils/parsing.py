@@ -0,0 +1,50 @@
+try:
+    import orjson as json_backend
+except ImportError:
+    import json as json_backend
+
+
+def loads(raw: bytes):
+    """Parses raw JSON response body with the fastest available backend."""
+    return json_backend.loads(raw)
+
+
+def project_match(match: dict,
+                  match_fields: list,
+                  player_fields: list,
+                  account_id: str,
+                  lobby_fields: list = None) -> dict:
+    """Keeps only required match-level fields and the requested player's
+    entry in "players", trimmed to required player-level fields. With
+    lobby fields given, compact stats of all players are kept in "lobby".
+    """
+    projected = {key: match.get(key) for key in match_fields if key != "players"}
+    players = match.get("players")
+    if "players" in match_fields:
+        projected["players"] = None if players is None else [
+            {key: player.get(key) for key in player_fields}
+            for player in players
+            if player.get("account_id") is not None
+            and str(player["account_id"]) == account_id
+        ]
+    if lobby_fields is not None:
+        projected["lobby"] = None if players is None else [
+            {key: player.get(key) for key in lobby_fields}
+            for player in players
+        ]
+    return projected
+
+
+def parse_match(raw: bytes,
+                match_fields: list,
+                player_fields: list,
+                account_id: str,
+                lobby_fields: list = None) -> dict:
+    """Parses match JSON and materializes only the projected fields, so the
+    full document can be freed right away. Raises ValueError for bodies
+    that aren't a match, like {"error": ...} or an HTML error page.
+    """
+    match = loads(raw)
+    if not isinstance(match, dict) or "error" in match:
+        raise ValueError(f"Not a match: {raw[:100]!r}")
+    return project_match(match, match_fields, player_fields, account_id, lobby_fields)
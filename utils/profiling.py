@@ -0,0 +1,152 @@
+from contextlib import contextmanager
+import cProfile
+from dataclasses import dataclass, field
+from functools import wraps
+import itertools
+import os
+from pathlib import Path
+import threading
+import tracemalloc
+
+
+# set to a directory (or to 1 for "profiles") to profile every pipeline run
+PROFILE_ENV = "DOTA_PROFILE"
+
+
+@dataclass
+class Profiler:
+    """Profiles pipeline stages: writes a pstats file per stage and appends
+    stage's top allocations to allocations.txt in the output directory.
+    Stages may be nested, an outer stage doesn't include time of the inner
+    ones. Stages of one process are numbered in a single sequence.
+    """
+
+    out_dir: str
+    top: int = 15
+    _counter: itertools.count = field(default_factory=itertools.count, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _local: threading.local = field(default_factory=threading.local, repr=False)
+
+    def __post_init__(self):
+        Path(self.out_dir).mkdir(parents=True, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def _active(self) -> list:
+        """Stack of enabled profiles of the current thread."""
+        if not hasattr(self._local, "active"):
+            self._local.active = []
+        return self._local.active
+
+    @property
+    def _accumulated(self) -> dict:
+        """Accumulated stages of the current thread waiting for flush()."""
+        if not hasattr(self._local, "accumulated"):
+            self._local.accumulated = {}
+        return self._local.accumulated
+
+    @contextmanager
+    def _enabled(self, profile: cProfile.Profile):
+        # only one profile may be enabled at a time, so the outer one pauses
+        if self._active:
+            self._active[-1].disable()
+        self._active.append(profile)
+        profile.enable()
+        try:
+            yield
+        finally:
+            self._active.pop().disable()
+            if self._active:
+                self._active[-1].enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        number = next(self._counter)
+        profile = cProfile.Profile()
+        before = tracemalloc.take_snapshot()
+        try:
+            with self._enabled(profile):
+                yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            out = Path(self.out_dir)
+            profile.dump_stats(str(out / f"{number:03d}_{name}.pstats"))
+
+            lines = [f"\n{number:03d} {name}"]
+            for diff in after.compare_to(before, "lineno")[:self.top]:
+                lines.append(f"  {diff.size_diff / 1024:+10.1f} KiB  {diff.traceback}")
+            with self._lock, open(out / "allocations.txt", "a") as report:
+                report.write("\n".join(lines) + "\n")
+
+    @contextmanager
+    def accumulate(self, name: str):
+        """Profiles a stage repeated many times (like once per match) into a
+        single profile written by flush(). No allocations are tracked, as a
+        snapshot per repetition would cost more than the stage itself.
+        """
+        if name not in self._accumulated:
+            self._accumulated[name] = (next(self._counter), cProfile.Profile())
+        _, profile = self._accumulated[name]
+        with self._enabled(profile):
+            yield
+
+    def flush(self) -> None:
+        """Writes accumulated stages of the current thread."""
+        for name, (number, profile) in self._accumulated.items():
+            profile.dump_stats(str(Path(self.out_dir) / f"{number:03d}_{name}.pstats"))
+        self._accumulated.clear()
+
+
+# one profiler per directory, so stages of different runs don't overwrite
+# each other's files
+_profilers = {}
+_profilers_lock = threading.Lock()
+
+
+def make_profiler(out_dir: str = None) -> Profiler:
+    """Returns the profiler of the directory if profiling is requested
+    through the argument or the environment variable, None otherwise.
+    """
+    out_dir = out_dir or os.environ.get(PROFILE_ENV)
+    if not out_dir:
+        return None
+    if out_dir.lower() in ("1", "true", "yes"):
+        out_dir = "profiles"
+    with _profilers_lock:
+        if out_dir not in _profilers:
+            _profilers[out_dir] = Profiler(out_dir)
+        return _profilers[out_dir]
+
+
+@contextmanager
+def maybe_stage(profiler: Profiler, name: str):
+    """Profiles a stage if there's a profiler, does nothing otherwise."""
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(name):
+            yield
+
+
+@contextmanager
+def maybe_accumulate(profiler: Profiler, name: str):
+    """Accumulates a repeated stage if there's a profiler."""
+    if profiler is None:
+        yield
+    else:
+        with profiler.accumulate(name):
+            yield
+
+
+def profiled(method):
+    """Profiles a method as a stage when its instance has a profiler."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.stage(method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
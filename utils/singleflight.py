@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import threading
+import time
+
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+@dataclass
+class SingleFlight:
+    """Process-wide deduplication of identical calls. Concurrent callers with
+    the same key wait for a single in-progress call and share its result,
+    which is then cached for ttl seconds (forever if ttl is None).
+    """
+
+    ttl: float = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _calls: Dict[Hashable, Future] = field(default_factory=dict, repr=False)
+    _results: Dict[Hashable, Tuple[float, Any]] = field(default_factory=dict, repr=False)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at >= self.ttl
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Returns cached or in-flight result for the key, calling fn only if
+        there is neither.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if key in self._results:
+                stored_at, result = self._results[key]
+                if not self._expired(stored_at, now):
+                    return result
+                del self._results[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as error:
+            with self._lock:
+                del self._calls[key]
+            call.set_exception(error)
+            raise
+
+        with self._lock:
+            now = time.monotonic()
+            self._results = {
+                k: v for k, v in self._results.items() if not self._expired(v[0], now)
+            }
+            self._results[key] = (now, result)
+            del self._calls[key]
+        call.set_result(result)
+        return result
+
+    def forget(self, key: Hashable) -> None:
+        """Drops cached result for the key."""
+        with self._lock:
+            self._results.pop(key, None)
@@ -0,0 +1,15 @@
+from utils import http
+from utils.helpers import get_heroes_data, get_patches_data, get_pro_players
+
+
+def warm_up() -> dict:
+    """One-time warm phase: fetches constants and lookup tables (which also
+    opens pooled connections of the shared session). Later calls are served
+    from process-wide caches without any network until constants expire.
+    """
+    return {
+        "patches_data": get_patches_data(),
+        "heroes_data": get_heroes_data(),
+        "pro_players": get_pro_players(),
+        "session": http.session,
+    }
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Allowed types of a field and keys its dict value must have."""
+
+    types: tuple
+    keys: tuple = ()
+
+
+INT = Rule((int,))
+NUMBER = Rule((int, float))
+LIST = Rule((list,))
+NAMED = Rule((dict,), keys=("name",))
+
+# fields not listed here only have to be present
+MATCH_SCHEMA = {
+    "match_id": INT,
+    "duration": INT,
+    "radiant_score": INT,
+    "dire_score": INT,
+    "radiant_gold_adv": LIST,
+    "radiant_xp_adv": LIST,
+    "radiant_team": NAMED,
+    "dire_team": NAMED,
+    "players": LIST,
+    "league": NAMED,
+    "patch": INT,
+    "start_time": INT,
+}
+PLAYER_SCHEMA = {
+    "match_id": INT,
+    "player_slot": INT,
+    "win": INT,
+    "hero_id": INT,
+    "kills": INT,
+    "assists": INT,
+    "deaths": INT,
+    "denies": INT,
+    "dn_t": LIST,
+    "last_hits": INT,
+    "lh_t": LIST,
+    "gold_per_min": INT,
+    "gold_t": LIST,
+    "total_gold": INT,
+    "kill_streaks": Rule((dict,)),
+    "pings": INT,
+    "xp_per_min": INT,
+    "xp_t": LIST,
+    "kda": NUMBER,
+    "neutral_kills": INT,
+    "lane_kills": INT,
+    "lane": INT,
+    "is_roaming": Rule((bool,)),
+}
+
+
+def find_violation(record: dict, fields: list, schema: dict) -> str:
+    """Returns reason the record breaks the schema or None if it's fine."""
+    for name in fields:
+        value = record.get(name)
+        if value is None or value != value:
+            return f"missing {name}"
+        rule = schema.get(name)
+        if rule is None:
+            continue
+        if not isinstance(value, rule.types):
+            return f"bad {name}"
+        for key in rule.keys:
+            if value.get(key) is None:
+                return f"missing {name}.{key}"
+    return None
+
+
+def validate_match(match: dict, match_fields: list, player_fields: list) -> str:
+    """Checks a projected match and the requested player's entry in it.
+    Returns rejection reason or None.
+    """
+    reason = find_violation(match, match_fields, MATCH_SCHEMA)
+    if reason is not None:
+        return reason
+    if "players" in match_fields:
+        if len(match["players"]) != 1:
+            return "player not in match"
+        reason = find_violation(match["players"][0], player_fields, PLAYER_SCHEMA)
+        if reason is not None:
+            return f"player {reason}"
+    return None